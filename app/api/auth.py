@@ -9,7 +9,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 
 from app.core.config import settings
-from app.core.security import PermissionManager, SecurityManager
+from app.core.security import (
+    PermissionManager,
+    SecurityManager,
+    run_password_work,
+)
 from app.dependencys.auth import get_current_admin, get_current_user
 from app.schemas.auth import (
     ChangePasswordRequest,
@@ -18,7 +22,7 @@ from app.schemas.auth import (
     RefreshTokenRequest,
     UserInfo,
 )
-from app.services.auth import ADMIN_USERS, AuthService
+from app.services.auth import AuthService
 
 # Initialize router
 router = APIRouter()
@@ -36,7 +40,10 @@ async def login(login_data: LoginRequest):
     # In production, implement proper rate limiting
 
     # Authenticate user
-    user = AuthService.authenticate_user(login_data.username, login_data.password)
+    # bcrypt is deliberately slow - keep it off the event loop
+    user = await run_password_work(
+        AuthService.authenticate_user, login_data.username, login_data.password
+    )
 
     if not user:
         raise HTTPException(
@@ -113,8 +120,10 @@ async def change_password(
     """Change user password"""
 
     # Verify current password
-    if not SecurityManager.verify_password(
-        password_data.current_password, current_user["password_hash"]
+    if not await run_password_work(
+        SecurityManager.verify_password,
+        password_data.current_password,
+        current_user["password_hash"],
     ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -136,8 +145,11 @@ async def change_password(
         )
 
     # Update password (in memory for this demo)
-    new_password_hash = SecurityManager.get_password_hash(password_data.new_password)
-    ADMIN_USERS[current_user["username"]]["password_hash"] = new_password_hash
+    new_password_hash = await run_password_work(
+        SecurityManager.get_password_hash, password_data.new_password
+    )
+    current_user["password_hash"] = new_password_hash
+    AuthService.invalidate_users_view()
 
     return {"message": "Password changed successfully"}
 
@@ -159,20 +171,7 @@ async def validate_token(current_user: dict = Depends(get_current_user)):
 @router.get("/users")
 async def list_users(current_admin: dict = Depends(get_current_admin)):
     """List all users (admin only)"""
-    users = []
-    for username, user_data in ADMIN_USERS.items():
-        users.append(
-            {
-                "id": user_data["id"],
-                "username": user_data["username"],
-                "email": user_data["email"],
-                "role": user_data["role"],
-                "is_active": user_data["is_active"],
-                "created_at": user_data["created_at"].isoformat(),
-            }
-        )
-
-    return {"users": users}
+    return {"users": AuthService.list_users()}
 
 
 @router.post("/users/{username}/toggle-status")
@@ -181,7 +180,8 @@ async def toggle_user_status(
 ):
     """Toggle user active status (admin only)"""
 
-    if username not in ADMIN_USERS:
+    user = AuthService.get_user_by_username(username)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
@@ -194,13 +194,14 @@ async def toggle_user_status(
         )
 
     # Toggle status
-    ADMIN_USERS[username]["is_active"] = not ADMIN_USERS[username]["is_active"]
-    new_status = "activated" if ADMIN_USERS[username]["is_active"] else "deactivated"
+    user["is_active"] = not user["is_active"]
+    AuthService.invalidate_users_view()
+    new_status = "activated" if user["is_active"] else "deactivated"
 
     return {
         "message": f"User {username} has been {new_status}",
         "user": username,
-        "is_active": ADMIN_USERS[username]["is_active"],
+        "is_active": user["is_active"],
     }
 
 
@@ -213,10 +214,7 @@ async def get_user_permissions(current_user: dict = Depends(get_current_user)):
     return {
         "user": current_user["username"],
         "permission_level": permission_level,
-        "permission_name": PermissionManager.get_permission_name(permission_level),
-        "can_upload_videos": PermissionManager.can_upload_video(permission_level),
-        "can_delete_videos": PermissionManager.can_delete_video(permission_level),
-        "can_manage_users": PermissionManager.can_manage_users(permission_level),
+        **PermissionManager.get_capabilities(permission_level),
     }
 
 
@@ -231,15 +229,15 @@ async def get_session_info(current_user: dict = Depends(get_current_user)):
         },
         "session": {
             "authenticated": True,
-            "login_time": datetime.utcnow().isoformat(),
+            "login_time": datetime.utcnow(),
             "expires_in": settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         },
         "capabilities": {
             "video_upload": True,
             "video_management": True,
             "analytics_access": True,
-            "user_management": PermissionManager.can_manage_users(
+            "user_management": PermissionManager.get_capabilities(
                 current_user["permission_level"]
-            ),
+            )["can_manage_users"],
         },
     }
@@ -3,27 +3,37 @@
 RESTful API for video management, upload, and streaming
 """
 
-import uuid
-from datetime import datetime
-from typing import Optional
-
+import asyncio
+import re
+import secrets
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Annotated, Optional
+
+from cachetools import LRUCache
 from fastapi import (
     APIRouter,
     Depends,
     File,
     Form,
     HTTPException,
+    Path,
     Request,
     Response,
     UploadFile,
     status,
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi_cache.decorator import cache
 
+from app.core.cache import VIDEOS_NAMESPACE, invalidate_cache
 from app.core.config import settings
+from app.core.database import get_async_session
+from app.core.rate_limit import limiter
 from app.dependencys.videos import (
     get_analytics_service,
     get_current_admin,
+    get_minio_service,
     get_search_service,
     get_video_service,
 )
@@ -44,24 +54,100 @@ from app.services.video_service import (
     VideoAnalyticsService,
     VideoSearchService,
     VideoService,
+    encode_cursor,
 )
 from celery_worker.tasks import generate_video_thumbnail_task, process_video_upload
 
 # Initialize router
 router = APIRouter()
 
+# Single byte range, e.g. "bytes=0-1023", "bytes=1024-" or "bytes=-500"
+RANGE_HEADER_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Video ids are UUIDs; malformed ids are rejected (422) before reaching the DB
+UUID_PATTERN = (
+    r"^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?"
+    r"[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$"
+)
+VideoId = Annotated[str, Path(pattern=UUID_PATTERN)]
+
+# Max deletions running at once in batch delete
+BATCH_DELETE_CONCURRENCY = 16
+
+# Statuses counted as "processing" on the dashboard
+PROCESSING_STATUSES = frozenset(
+    {VideoStatus.PENDING, VideoStatus.UPLOADING, VideoStatus.PROCESSING}
+)
+
+# Serialized VideoResponse cache keyed by (video_id, updated_at)
+_video_response_cache: LRUCache = LRUCache(maxsize=10000)
+
+
+class RawJSONResponse(ORJSONResponse):
+    """JSON response whose content is already encoded bytes"""
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+def _serialize_video(video) -> VideoResponse:
+    """Serialize a Video ORM object, reusing the cached result if unchanged"""
+    key = (video.id, video.updated_at)
+    response = _video_response_cache.get(key)
+    if response is None:
+        response = VideoResponse.model_validate(video)
+        _video_response_cache[key] = response
+    return response
+
+
+def _validator_headers(info: dict) -> dict:
+    """ETag/Last-Modified for a stored object, taken from its stat_file info"""
+    modified_at = datetime.fromisoformat(info["last_modified"])
+    etag = info["etag"].strip('"')
+    return {
+        "ETag": f'"{etag}"',
+        "Last-Modified": formatdate(modified_at.timestamp(), usegmt=True),
+    }
+
+
+def _is_not_modified(request: Request, etag: str, modified_at: datetime) -> bool:
+    """Check conditional request headers against the current validators"""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = request.headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        if modified_at.tzinfo is None:
+            modified_at = modified_at.replace(tzinfo=timezone.utc)
+        modified = modified_at.replace(microsecond=0)
+        return since.tzinfo is not None and modified <= since
+
+    return False
+
 
 # Video Management Endpoints
 @router.get("/", response_model=VideoListResponse)
+@cache(expire=10, namespace=VIDEOS_NAMESPACE)
 async def list_videos(
     skip: int = 0,
     limit: int = 50,
     status: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
     video_service: VideoService = Depends(get_video_service),
     current_user=Depends(get_current_admin),
 ):
-    """List all videos with filtering and pagination"""
+    """List all videos with filtering and pagination
+
+    Follow `next_cursor` for deep pages; `skip` still works but scans past rows.
+    """
 
     # Convert status string to enum if provided
     video_status = None
@@ -76,23 +162,37 @@ async def list_videos(
 
     # Get videos
     videos = await video_service.get_videos(
-        skip=skip, limit=limit, status=video_status, search=search
+        skip=skip, limit=limit, status=video_status, search=search, cursor=cursor
+    )
+    next_cursor = (
+        encode_cursor(videos[-1].created_at, videos[-1].id)
+        if len(videos) == limit
+        else None
     )
 
-    # Get total count (simplified - in production you'd want a separate count query)
-    total = len(videos) + skip
+    # The service ignores skip once a cursor is given; so does the page math
+    offset = 0 if cursor else skip
 
-    return VideoListResponse(
-        videos=[VideoResponse.from_orm(video) for video in videos],
-        total=total,
-        page=skip // limit + 1,
-        per_page=limit,
+    # Get total count (simplified - in production you'd want a separate count query)
+    total = len(videos) + offset
+
+    # Pre-encoded body: skips response_model re-validation on cache misses
+    return RawJSONResponse(
+        VideoListResponse.dump_bytes(
+            [_serialize_video(video) for video in videos],
+            total=total,
+            page=offset // limit + 1,
+            per_page=limit,
+            next_cursor=next_cursor,
+            has_prev=bool(cursor) or offset > 0,
+        )
     )
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
+@cache(expire=30, namespace=VIDEOS_NAMESPACE)
 async def get_video(
-    video_id: str, video_service: VideoService = Depends(get_video_service)
+    video_id: VideoId, video_service: VideoService = Depends(get_video_service)
 ):
     """Get video by ID"""
     video = await video_service.get_video_by_id(video_id)
@@ -101,7 +201,7 @@ async def get_video(
             status_code=status.HTTP_404_NOT_FOUND, detail="Video not found"
         )
 
-    return VideoResponse.from_orm(video)
+    return _serialize_video(video)
 
 
 @router.post("/upload", response_model=VideoUploadResponse)
@@ -125,6 +225,7 @@ async def upload_video(
 
         # Trigger background processing
         task = process_video_upload.delay(video.id, video.file_path)
+        await invalidate_cache(VIDEOS_NAMESPACE)
 
         return VideoUploadResponse(
             video_id=video.id,
@@ -142,13 +243,14 @@ async def upload_video(
 
 @router.delete("/{video_id}")
 async def delete_video(
-    video_id: str,
+    video_id: VideoId,
     video_service: VideoService = Depends(get_video_service),
     current_user=Depends(get_current_admin),
 ):
     """Delete a video"""
     success = await video_service.delete_video(video_id)
     if success:
+        await invalidate_cache(VIDEOS_NAMESPACE)
         return {"message": "Video deleted successfully"}
     else:
         raise HTTPException(
@@ -159,11 +261,11 @@ async def delete_video(
 
 # Video Streaming Endpoints
 @router.get("/{video_id}/stream")
+@limiter.exempt  # a player issues many range requests per minute
 async def stream_video(
-    video_id: str,
+    video_id: VideoId,
     request: Request,
     video_service: VideoService = Depends(get_video_service),
-    analytics_service: VideoAnalyticsService = Depends(get_analytics_service),
 ):
     """Stream video content as blob"""
 
@@ -175,11 +277,12 @@ async def stream_video(
         )
 
     # Record view (simplified - you might want more sophisticated tracking)
-    session_id = request.headers.get("X-Session-ID", str(uuid.uuid4()))
+    session_id = request.headers.get("X-Session-ID") or secrets.token_hex(16)
     user_ip = request.client.host
     user_agent = request.headers.get("User-Agent")
 
-    await analytics_service.record_video_view(
+    # Buffered and batch-inserted by the view flusher, off the request path
+    VideoAnalyticsService.enqueue_video_view(
         video_id=video_id,
         session_id=session_id,
         ip_address=user_ip,
@@ -187,54 +290,72 @@ async def stream_video(
     )
 
     try:
-        # Get video content
-        content = await video_service.stream_video_content(video_id)
-
-        # Create streaming response
-        def generate():
-            chunk_size = settings.STREAMING_CHUNK_SIZE
-            for i in range(0, len(content), chunk_size):
-                yield content[i : i + chunk_size]
+        # Object size from storage metadata (HEAD) - the body is never buffered
+        file_size, _, _ = await video_service.get_video_object_stat(video)
 
         # Prepare headers
         headers = {
             "Content-Type": video.file_type,
-            "Content-Length": str(len(content)),
             "Accept-Ranges": "bytes",
             "Cache-Control": "no-cache, no-store, must-revalidate",
             "Pragma": "no-cache",
             "Expires": "0",
         }
 
+        start, end = 0, file_size - 1
+        status_code = status.HTTP_200_OK
+
         # Handle range requests for video seeking
         range_header = request.headers.get("Range")
         if range_header:
-            # Parse range header
-            range_match = range_header.replace("bytes=", "").split("-")
-            start = int(range_match[0]) if range_match[0] else 0
-            end = int(range_match[1]) if range_match[1] else len(content) - 1
-
-            # Return partial content
-            partial_content = content[start : end + 1]
-
-            headers.update(
-                {
-                    "Content-Range": f"bytes {start}-{end}/{len(content)}",
-                    "Content-Length": str(len(partial_content)),
-                }
-            )
+            # Parse range header (single range only)
+            range_match = RANGE_HEADER_RE.match(range_header)
+            if range_match is None or range_match.group(1, 2) == ("", ""):
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers={"Content-Range": f"bytes */{file_size}"},
+                )
+
+            first, last = range_match.groups()
+            if first:
+                start = int(first)
+                if last:
+                    end = min(int(last), file_size - 1)
+            else:
+                # Suffix range: the final N bytes
+                start = max(file_size - int(last), 0)
+
+            if start > end:
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers={"Content-Range": f"bytes */{file_size}"},
+                )
+
+            headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+            status_code = status.HTTP_206_PARTIAL_CONTENT
 
+        content_length = end - start + 1
+        headers["Content-Length"] = str(content_length)
+
+        # Ranges that fit in one chunk go out as a single buffer - no
+        # threadpool-driven iterator for the typical small seek request
+        if content_length <= settings.STREAMING_CHUNK_SIZE:
             return Response(
-                content=partial_content,
-                status_code=206,
-                headers=headers,
+                content=await video_service.read_range(video, start, end),
+                status_code=status_code,
                 media_type=video.file_type,
+                headers=headers,
             )
 
         return StreamingResponse(
-            generate(), media_type=video.file_type, headers=headers
+            await video_service.stream_range(video, start, end),
+            status_code=status_code,
+            media_type=video.file_type,
+            headers=headers,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -243,8 +364,12 @@ async def stream_video(
 
 
 @router.get("/{video_id}/thumbnail")
+@limiter.exempt
 async def get_video_thumbnail(
-    video_id: str, video_service: VideoService = Depends(get_video_service)
+    video_id: VideoId,
+    request: Request,
+    video_service: VideoService = Depends(get_video_service),
+    minio_service: MinIOService = Depends(get_minio_service),
 ):
     """Get video thumbnail"""
     video = await video_service.get_video_by_id(video_id)
@@ -258,15 +383,31 @@ async def get_video_thumbnail(
         task = generate_video_thumbnail_task.delay(video_id)
         return {"message": "Thumbnail generation started", "task_id": task.id}
 
+    # Validators come from the object itself (regenerating a thumbnail doesn't
+    # touch updated_at); clients with a fresh copy get a 304 without a GET
+    info = await minio_service.stat_file(video.thumbnail_path)
+    if info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Thumbnail not found"
+        )
+
+    headers = {
+        "Cache-Control": "public, max-age=3600",
+        **_validator_headers(info),
+    }
+    if _is_not_modified(
+        request, headers["ETag"], datetime.fromisoformat(info["last_modified"])
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
     try:
         # Get thumbnail from storage
-        minio_service = MinIOService()
         thumbnail_content = await minio_service.get_file_content(video.thumbnail_path)
 
         return Response(
             content=thumbnail_content,
             media_type="image/jpeg",
-            headers={"Cache-Control": "public, max-age=3600"},
+            headers=headers,
         )
 
     except Exception as e:
@@ -278,7 +419,7 @@ async def get_video_thumbnail(
 
 @router.get("/{video_id}/url")
 async def get_video_url(
-    video_id: str,
+    video_id: VideoId,
     expires_in: int = 3600,
     video_service: VideoService = Depends(get_video_service),
     current_user=Depends(get_current_admin),
@@ -298,28 +439,33 @@ async def get_video_url(
 # Video Progress Tracking
 @router.post("/{video_id}/progress", response_model=VideoProgressResponse)
 async def update_video_progress(
-    video_id: str,
+    video_id: VideoId,
     progress_data: VideoProgressRequest,
     video_service: VideoService = Depends(get_video_service),
 ):
     """Update video viewing progress"""
-    view_session = await video_service.update_video_progress(
+    progress = await video_service.update_video_progress(
         video_id=video_id,
         session_id=progress_data.session_id,
         current_time=progress_data.current_time,
+        user_id=progress_data.user_id,
     )
 
-    return VideoProgressResponse(
-        video_id=video_id,
-        current_time=view_session.current_time,
-        completion_percentage=view_session.completion_percentage,
-        resume_position=view_session.resume_position,
+    return RawJSONResponse(
+        VideoProgressResponse(
+            video_id=video_id,
+            current_time=progress.current_time,
+            completion_percentage=progress.completion_percentage,
+            resume_position=progress.resume_position,
+            last_accessed=progress.last_accessed,
+            is_completed=progress.is_completed,
+        ).dump_bytes()
     )
 
 
 @router.get("/{video_id}/progress")
 async def get_video_progress(
-    video_id: str,
+    video_id: VideoId,
     session_id: str,
     video_service: VideoService = Depends(get_video_service),
 ):
@@ -336,14 +482,14 @@ async def get_video_progress(
         "current_time": view_session.current_time,
         "completion_percentage": view_session.completion_percentage,
         "resume_position": view_session.resume_position,
-        "last_accessed": view_session.last_accessed.isoformat(),
+        "last_accessed": view_session.last_accessed,
     }
 
 
 # Video Analytics
 @router.get("/{video_id}/stats", response_model=VideoStatsResponse)
 async def get_video_statistics(
-    video_id: str,
+    video_id: VideoId,
     video_service: VideoService = Depends(get_video_service),
     current_user=Depends(get_current_admin),
 ):
@@ -353,15 +499,14 @@ async def get_video_statistics(
 
 
 @router.get("/{video_id}/analytics")
+@cache(expire=60, namespace=VIDEOS_NAMESPACE)
 async def get_video_analytics(
-    video_id: str,
+    video_id: VideoId,
     days: int = 30,
     analytics_service: VideoAnalyticsService = Depends(get_analytics_service),
     current_user=Depends(get_current_admin),
 ):
     """Get detailed video analytics"""
-    from datetime import datetime, timedelta
-
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
 
@@ -378,23 +523,31 @@ async def search_videos(
     q: str,
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
     search_service: VideoSearchService = Depends(get_search_service),
 ):
     """Search videos by title and description"""
-    videos = await search_service.search_videos(query=q, limit=limit, offset=offset)
+    videos = await search_service.search_videos(
+        query=q, limit=limit, offset=offset, cursor=cursor
+    )
+    last = videos[-1] if len(videos) == limit else None
 
     return {
         "query": q,
-        "results": [VideoResponse.from_orm(video) for video in videos],
+        "results": [_serialize_video(video) for video in videos],
         "total": len(videos),
         "offset": offset,
         "limit": limit,
+        "next_cursor": (
+            encode_cursor(last.view_count, last.created_at, last.id) if last else None
+        ),
     }
 
 
 @router.get("/{video_id}/recommendations")
+@cache(expire=60, namespace=VIDEOS_NAMESPACE)
 async def get_video_recommendations(
-    video_id: str,
+    video_id: VideoId,
     limit: int = 5,
     search_service: VideoSearchService = Depends(get_search_service),
 ):
@@ -405,14 +558,14 @@ async def get_video_recommendations(
 
     return {
         "video_id": video_id,
-        "recommendations": [VideoResponse.from_orm(video) for video in recommendations],
+        "recommendations": [_serialize_video(video) for video in recommendations],
     }
 
 
 # Upload Status
 @router.get("/{video_id}/status")
 async def get_upload_status(
-    video_id: str, video_service: VideoService = Depends(get_video_service)
+    video_id: VideoId, video_service: VideoService = Depends(get_video_service)
 ):
     """Get video upload/processing status"""
     video = await video_service.get_video_by_id(video_id)
@@ -426,10 +579,10 @@ async def get_upload_status(
         "status": video.status,
         "processing_progress": video.processing_progress,
         "error_message": video.error_message,
-        "created_at": video.created_at.isoformat(),
-        "updated_at": video.updated_at.isoformat(),
-        "uploaded_at": video.uploaded_at.isoformat() if video.uploaded_at else None,
-        "processed_at": video.processed_at.isoformat() if video.processed_at else None,
+        "created_at": video.created_at,
+        "updated_at": video.updated_at,
+        "uploaded_at": video.uploaded_at,
+        "processed_at": video.processed_at,
     }
 
 
@@ -437,7 +590,6 @@ async def get_upload_status(
 @router.post("/batch/delete", response_model=BatchDeleteResponse)
 async def batch_delete_videos(
     request: BatchDeleteRequest,
-    video_service: VideoService = Depends(get_video_service),
     current_user=Depends(get_current_admin),
 ):
     """Delete multiple videos"""
@@ -447,30 +599,43 @@ async def batch_delete_videos(
             detail="Confirmation required for batch delete operation",
         )
 
+    semaphore = asyncio.Semaphore(BATCH_DELETE_CONCURRENCY)
+
+    async def _safe_delete(video_id: str):
+        # Each deletion gets its own session - an AsyncSession must not be
+        # shared between concurrently running tasks
+        async with semaphore, get_async_session() as db:
+            try:
+                success = await VideoService(db, get_minio_service()).delete_video(
+                    video_id
+                )
+                if success:
+                    return video_id, True, None
+                return video_id, False, f"Failed to delete video {video_id}"
+            except Exception as e:
+                return video_id, False, str(e)
+
+    outcomes = await asyncio.gather(
+        *(_safe_delete(video_id) for video_id in request.video_ids)
+    )
+
     results = []
     successful = 0
     failed = 0
     errors = []
 
-    for video_id in request.video_ids:
-        try:
-            success = await video_service.delete_video(video_id)
-            if success:
-                successful += 1
-                results.append({"video_id": video_id, "success": True})
-            else:
-                failed += 1
-                error_msg = f"Failed to delete video {video_id}"
-                errors.append(error_msg)
-                results.append(
-                    {"video_id": video_id, "success": False, "error": error_msg}
-                )
-        except Exception as e:
+    for video_id, success, error_msg in outcomes:
+        if success:
+            successful += 1
+            results.append({"video_id": video_id, "success": True})
+        else:
             failed += 1
-            error_msg = str(e)
             errors.append(f"Video {video_id}: {error_msg}")
             results.append({"video_id": video_id, "success": False, "error": error_msg})
 
+    if successful:
+        await invalidate_cache(VIDEOS_NAMESPACE)
+
     return BatchDeleteResponse(
         results=results,
         total_requested=len(request.video_ids),
@@ -482,6 +647,7 @@ async def batch_delete_videos(
 
 # Dashboard Data
 @router.get("/dashboard/overview", response_model=DashboardOverviewResponse)
+@cache(expire=60, namespace=VIDEOS_NAMESPACE)
 async def get_dashboard_overview(
     analytics_service: VideoAnalyticsService = Depends(get_analytics_service),
     video_service: VideoService = Depends(get_video_service),
@@ -495,49 +661,45 @@ async def get_dashboard_overview(
         # Get recent uploads
         recent_videos = await video_service.get_videos(skip=0, limit=5)
 
-        # Calculate summary stats
-        all_videos = await video_service.get_videos(
-            skip=0, limit=1000
-        )  # Get more for stats
+        # Calculate summary stats (aggregated in the database)
+        status_counts = await video_service.get_dashboard_counts()
+
+        total_videos = completed = processing = failed = 0
+        total_views = total_size = 0
+        total_duration = 0.0
+        for video_status, bucket in status_counts.items():
+            if video_status == VideoStatus.COMPLETED:
+                completed += bucket["count"]
+            elif video_status in PROCESSING_STATUSES:
+                processing += bucket["count"]
+            elif video_status == VideoStatus.FAILED:
+                failed += bucket["count"]
+            total_videos += bucket["count"]
+            total_views += bucket["views"]
+            total_size += bucket["size"]
+            total_duration += bucket["duration"]
 
         summary = {
-            "total_videos": len(all_videos),
-            "completed_videos": len(
-                [v for v in all_videos if v.status == VideoStatus.COMPLETED]
-            ),
-            "processing_videos": len(
-                [
-                    v
-                    for v in all_videos
-                    if v.status
-                    in [
-                        VideoStatus.PENDING,
-                        VideoStatus.UPLOADING,
-                        VideoStatus.PROCESSING,
-                    ]
-                ]
-            ),
-            "failed_videos": len(
-                [v for v in all_videos if v.status == VideoStatus.FAILED]
-            ),
-            "total_views": sum(v.view_count for v in all_videos),
-            "total_storage_mb": sum(v.file_size for v in all_videos) / (1024 * 1024),
+            "total_videos": total_videos,
+            "completed_videos": completed,
+            "processing_videos": processing,
+            "failed_videos": failed,
+            "total_views": total_views,
+            "total_storage_mb": total_size / (1024 * 1024),
         }
 
         analytics = {
             "upload_trend": "increasing",  # Would calculate from real data
             "popular_formats": {"mp4": 75, "webm": 20, "mov": 5},
             "avg_duration_minutes": (
-                sum(v.duration or 0 for v in all_videos) / len(all_videos) / 60
-                if all_videos
-                else 0
+                total_duration / total_videos / 60 if total_videos else 0
             ),
         }
 
         return DashboardOverviewResponse(
             summary=summary,
-            # top_videos=top_videos,
-            recent_uploads=[VideoResponse.from_orm(v) for v in recent_videos],
+            top_videos=top_videos,
+            recent_uploads=[_serialize_video(v) for v in recent_videos],
             analytics=analytics,
             period="last_30_days",
             generated_at=datetime.utcnow(),
@@ -0,0 +1,80 @@
+"""
+⚡ Video Streaming Backend Response Cache
+Redis-backed endpoint caching with fastapi-cache2
+"""
+
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 🏷️ Cache namespaces
+VIDEOS_NAMESPACE = "videos"
+
+
+def request_key_builder(
+    func,
+    namespace: str = "",
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    *args,
+    **kwargs,
+) -> str:
+    """Build cache key from the request path and query params only
+
+    The default builder hashes the endpoint kwargs, which include per-request
+    dependency instances (services, DB sessions) and so never hit.
+    """
+    return ":".join(
+        [
+            namespace,
+            request.method.lower(),
+            request.url.path,
+            repr(sorted(request.query_params.items())),
+        ]
+    )
+
+
+@lru_cache()
+def get_redis() -> aioredis.Redis:
+    """Shared Redis client for app state (str responses, separate from the cache)"""
+    return aioredis.from_url(
+        settings.REDIS_URL,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+        decode_responses=True,
+    )
+
+
+async def init_cache():
+    """Initialize the response cache backend"""
+    redis = aioredis.from_url(
+        settings.REDIS_URL,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+    )
+    FastAPICache.init(
+        RedisBackend(redis),
+        prefix="vstream",
+        key_builder=request_key_builder,
+        enable=settings.ENABLE_CACHING,
+    )
+
+
+async def invalidate_cache(namespace: str):
+    """Drop all cached responses in a namespace"""
+    if not settings.ENABLE_CACHING:
+        return
+
+    try:
+        await FastAPICache.clear(namespace=namespace)
+    except Exception as e:
+        logger.warning("⚠️ Cache invalidation failed for %s: %s", namespace, e)
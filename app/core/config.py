@@ -3,11 +3,47 @@
 Core application settings and environment variables
 """
 
-from functools import lru_cache
-from typing import List, Optional, Union
+import json
+from functools import cached_property, lru_cache
+from typing import FrozenSet, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
-from pydantic import AnyHttpUrl, validator
-from pydantic_settings import BaseSettings
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# Shared env loading for the root settings and every sub-settings group
+_ENV_CONFIG = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="ignore")
+
+
+class EmailSettings(BaseSettings):
+    """SMTP settings, loaded only when email is used"""
+
+    model_config = _ENV_CONFIG
+
+    SMTP_HOST: str = "smtp.gmail.com"
+    SMTP_PORT: int = 587
+    SMTP_USER: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_TLS: bool = True
+
+
+class UiSettings(BaseSettings):
+    """Branding settings, loaded only when the UI asks for them"""
+
+    model_config = _ENV_CONFIG
+
+    BRAND_NAME: str = "Your Video Platform"
+    BRAND_LOGO_URL: str = ""
+    CUSTOM_CSS_URL: str = ""
+
+
+class IntegrationsSettings(BaseSettings):
+    """External service settings, loaded only when an integration is used"""
+
+    model_config = _ENV_CONFIG
+
+    ANALYTICS_API_KEY: str = ""
+    ELASTICSEARCH_URL: str = "http://localhost:9200"
 
 
 class Settings(BaseSettings):
@@ -25,21 +61,38 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    BCRYPT_ROUNDS: int = 12
 
     # 📊 Database Configuration
     DATABASE_URL: str = "sqlite:///./video_streaming.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_USE_PGBOUNCER: bool = False  # pool in PgBouncer instead of in-process
 
     # 🔗 API Configuration
     API_V1_STR: str = "/api/v1"
-    CORS_ORIGINS: List[AnyHttpUrl] = []
-
-    @validator("CORS_ORIGINS", pre=True)
-    def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
-        if isinstance(v, str) and not v.startswith("["):
-            return [i.strip() for i in v.split(",")]
-        elif isinstance(v, (list, str)):
-            return v
-        raise ValueError(v)
+    # str is accepted so comma-separated env values reach the validator
+    CORS_ORIGINS: Union[List[str], str] = []
+
+    @field_validator("CORS_ORIGINS", mode="before")
+    @classmethod
+    def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
+        if isinstance(v, str):
+            v = json.loads(v) if v.startswith("[") else v.split(",")
+        if not isinstance(v, (list, tuple)):
+            raise ValueError(v)
+
+        origins = []
+        for origin in v:
+            origin = str(origin).strip().rstrip("/")
+            if not origin:
+                continue
+            if not origin.startswith(("http://", "https://")):
+                raise ValueError(f"Invalid CORS origin: {origin}")
+            origins.append(origin)
+        return origins
 
     # 📁 File Storage Settings
     MAX_UPLOAD_SIZE: int = 209715200  # 200MB in bytes
@@ -52,6 +105,8 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str = "minioadmin"
     MINIO_BUCKET_NAME: str = "video-streaming"
     MINIO_SECURE: bool = False
+    MINIO_REGION: str = "us-east-1"
+    MINIO_MAX_CONCURRENCY: int = 32  # storage executor threads / in-flight calls
 
     # AWS S3 Configuration (alternative to MinIO)
     AWS_ACCESS_KEY_ID: Optional[str] = None
@@ -87,10 +142,10 @@ class Settings(BaseSettings):
     ADMIN_USERNAME: str = "admin"
     ADMIN_EMAIL: str = "admin@example.com"
     ADMIN_PASSWORD: str = "admin123"
+    ADMIN_PASSWORD_HASH: str = ""  # bcrypt hash; when set, ADMIN_PASSWORD is unused
 
-    # 🌐 External Services
+    # 🌐 External Services (keys live in IntegrationsSettings)
     ENABLE_ANALYTICS: bool = False
-    ANALYTICS_API_KEY: str = ""
 
     # 📱 Frontend Settings
     FRONTEND_URL: str = "http://localhost:3000"
@@ -105,6 +160,7 @@ class Settings(BaseSettings):
 
     # 🏥 Health Check Settings
     HEALTH_CHECK_INTERVAL: int = 30
+    HEALTH_CACHE_TTL: float = 5.0  # seconds a health result is reused
     ENABLE_HEALTH_CHECKS: bool = True
 
     # 🎥 Video Streaming Settings
@@ -127,42 +183,43 @@ class Settings(BaseSettings):
 
     # 🔍 Search & Indexing
     ENABLE_VIDEO_SEARCH: bool = True
-    ELASTICSEARCH_URL: str = "http://localhost:9200"
 
-    # 📧 Email Settings
+    # 📧 Email Settings (SMTP details live in EmailSettings)
     EMAIL_ENABLED: bool = False
-    SMTP_HOST: str = "smtp.gmail.com"
-    SMTP_PORT: int = 587
-    SMTP_USER: str = ""
-    SMTP_PASSWORD: str = ""
-    SMTP_TLS: bool = True
-
-    # 🎨 UI Customization
-    BRAND_NAME: str = "Your Video Platform"
-    BRAND_LOGO_URL: str = ""
-    CUSTOM_CSS_URL: str = ""
 
     # 🔧 Development Settings
     AUTO_RELOAD: bool = True
     ENABLE_DEBUG_TOOLBAR: bool = True
     ENABLE_PROFILING: bool = False
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        extra = "ignore"  # << qo‘shildi
+    model_config = _ENV_CONFIG
 
-    @property
+    @cached_property
+    def email(self) -> EmailSettings:
+        """Get SMTP settings"""
+        return EmailSettings()
+
+    @cached_property
+    def ui(self) -> UiSettings:
+        """Get UI customization settings"""
+        return UiSettings()
+
+    @cached_property
+    def integrations(self) -> IntegrationsSettings:
+        """Get external service settings"""
+        return IntegrationsSettings()
+
+    @cached_property
     def is_development(self) -> bool:
         """Check if running in development mode"""
         return self.ENVIRONMENT.lower() == "development"
 
-    @property
+    @cached_property
     def is_production(self) -> bool:
         """Check if running in production mode"""
         return self.ENVIRONMENT.lower() == "production"
 
-    @property
+    @cached_property
     def database_url_async(self) -> str:
         """Get async database URL"""
         if self.DATABASE_URL.startswith("postgresql://"):
@@ -171,10 +228,22 @@ class Settings(BaseSettings):
             )
         return self.DATABASE_URL
 
-    @property
-    def allowed_hosts(self) -> List[str]:
+    @cached_property
+    def allowed_video_extensions(self) -> FrozenSet[str]:
+        """Get lowercased allowed video extensions for O(1) lookups"""
+        return frozenset(ext.lower() for ext in self.ALLOWED_VIDEO_EXTENSIONS)
+
+    @cached_property
+    def allowed_hosts(self) -> Tuple[str, ...]:
         """Get allowed hosts for CORS"""
-        return [str(origin) for origin in self.CORS_ORIGINS]
+        return tuple(str(origin) for origin in self.CORS_ORIGINS)
+
+    @cached_property
+    def trusted_hosts(self) -> Tuple[str, ...]:
+        """Get Host header names for TrustedHostMiddleware (from CORS origins)"""
+        return tuple(
+            dict.fromkeys(urlsplit(origin).hostname for origin in self.allowed_hosts)
+        )
 
 
 @lru_cache()
@@ -3,16 +3,17 @@
 SQLAlchemy setup with async support
 """
 
-import asyncio
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, List, Optional, Tuple
 
-from sqlalchemy import MetaData, create_engine
+from sqlalchemy import DateTime, MetaData, create_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 from sqlalchemy.sql import text
+from sqlalchemy.sql.functions import FunctionElement
 
 from app.core.config import settings
 
@@ -42,21 +43,32 @@ else:
         "Using PostgreSQL async database configuration", SQLALCHEMY_DATABASE_URL_ASYNC
     )
     # PostgreSQL configuration
+    # Sync engine only backs get_db and dev scripts, so don't hold idle connections
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
         echo=False,
-        pool_pre_ping=True,
-        pool_size=20,
-        max_overflow=30,
+        poolclass=NullPool,
     )
 
-    async_engine = create_async_engine(
-        SQLALCHEMY_DATABASE_URL_ASYNC,
-        echo=False,
-        pool_pre_ping=True,
-        pool_size=20,
-        max_overflow=30,
-    )
+    if settings.DB_USE_PGBOUNCER:
+        # PgBouncer (transaction mode) already pools; a second pool here
+        # would pin server connections, and asyncpg's statement cache breaks
+        async_engine = create_async_engine(
+            SQLALCHEMY_DATABASE_URL_ASYNC,
+            echo=False,
+            poolclass=NullPool,
+            connect_args={"statement_cache_size": 0},
+        )
+    else:
+        async_engine = create_async_engine(
+            SQLALCHEMY_DATABASE_URL_ASYNC,
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
 
 # 🏗️ Session Configuration
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -65,10 +77,48 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 # 📋 Base Model
-Base = declarative_base()
+# 🔧 Deterministic constraint names keep future migrations diffable
+NAMING_CONVENTION = {
+    "ix": "ix_%(column_0_label)s",
+    "uq": "uq_%(table_name)s_%(column_0_name)s",
+    "ck": "ck_%(table_name)s_%(constraint_name)s",
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+    "pk": "pk_%(table_name)s",
+}
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all models"""
+
+    metadata = MetaData(naming_convention=NAMING_CONVENTION)
+
+    # Load server-generated timestamps back via RETURNING after INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
+
+
+# ⏰ Server-side UTC timestamp for column defaults
+class utcnow(FunctionElement):
+    """Current UTC time, evaluated by the database"""
+
+    type = DateTime()
+    inherit_cache = True
 
-# 🔧 Metadata for migrations
-metadata = MetaData()
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _sqlite_utcnow(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has whole seconds; match SQLAlchemy's stored
+    # DateTime text (microseconds, 6 digits) so values order and compare right
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now') || '000')"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
 
 
 # 🔄 Database Dependencies
@@ -87,26 +137,23 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get async database session
     """
+    # The session's own context manager closes it on exit
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
 
 
-@asynccontextmanager
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    """
-    Context manager for async database session
-    """
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+# Same session lifecycle, usable as `async with get_async_session() as db`
+get_async_session = asynccontextmanager(get_async_db)
 
 
 # 🚀 Database Utilities
+_PING_QUERY = text("SELECT 1")
+
+# Successful checks within this window skip the round-trip
+CONNECTION_CHECK_TTL = 2.0  # seconds
+_last_connection_ok = float("-inf")
+
+
 class DatabaseManager:
     """Database management utilities"""
 
@@ -116,11 +163,20 @@ class DatabaseManager:
         try:
             async with async_engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(DatabaseManager._create_missing_indexes)
             print("✅ Database tables created successfully")
         except Exception as e:
             print(f"❌ Error creating database tables: {e}")
             raise e
 
+    @staticmethod
+    def _create_missing_indexes(conn):
+        """Add indexes declared on models to tables that predate them"""
+        # create_all only emits indexes together with a new table
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
     @staticmethod
     async def drop_tables():
         """Drop all database tables"""
@@ -135,11 +191,17 @@ class DatabaseManager:
 
     @staticmethod
     async def check_connection() -> bool:
-        """Check if database connection is working"""
+        """Check if database connection is working (recent success is reused)"""
+        global _last_connection_ok
+        now = time.monotonic()
+        if now - _last_connection_ok < CONNECTION_CHECK_TTL:
+            return True
+
         try:
-            async with AsyncSessionLocal() as session:
-                await session.execute(text("SELECT 1"))
-                return True
+            async with async_engine.connect() as conn:
+                await conn.scalar(_PING_QUERY)
+            _last_connection_ok = now
+            return True
         except Exception as e:
             print(f"Database connection error: {e}")
             return False
@@ -226,13 +288,12 @@ class TestDatabase:
 async def health_check() -> dict:
     """Database health check"""
     try:
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
 
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(text("SELECT 1"))
-            result.scalar()
+        async with async_engine.connect() as conn:
+            await conn.scalar(_PING_QUERY)
 
-        end_time = asyncio.get_event_loop().time()
+        end_time = time.perf_counter()
         response_time = (end_time - start_time) * 1000  # Convert to milliseconds
 
         return {
@@ -251,32 +312,49 @@ async def health_check() -> dict:
 
 
 # 📊 Database Statistics
+DATABASE_STATS_TTL = 60  # seconds
+
+if settings.DATABASE_URL.startswith("sqlite"):
+    _TABLES_QUERY = text("SELECT name FROM sqlite_master WHERE type='table'")
+else:
+    _TABLES_QUERY = text(
+        "SELECT table_name FROM information_schema.tables WHERE table_schema='public'"
+    )
+
+# (fetched_at, tables) - the table list only changes on migrations
+_tables_cache: Optional[Tuple[float, List[str]]] = None
+
+
+async def _get_table_names() -> List[str]:
+    """Get table names, cached for DATABASE_STATS_TTL seconds"""
+    global _tables_cache
+    now = time.monotonic()
+    if _tables_cache is not None and now - _tables_cache[0] < DATABASE_STATS_TTL:
+        return _tables_cache[1]
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(_TABLES_QUERY)
+        tables = [row[0] for row in result.fetchall()]
+
+    _tables_cache = (now, tables)
+    return tables
+
+
 async def get_database_stats() -> dict:
     """Get database statistics"""
     try:
-        async with AsyncSessionLocal() as session:
-            # Get table information
-            if settings.DATABASE_URL.startswith("sqlite"):
-                result = await session.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                )
-                tables = [row[0] for row in result.fetchall()]
-            else:
-                result = await session.execute(
-                    "SELECT table_name FROM information_schema.tables WHERE table_schema='public'"
-                )
-                tables = [row[0] for row in result.fetchall()]
-
-            return {
-                "tables": tables,
-                "table_count": len(tables),
-                "database_url": settings.DATABASE_URL.split("://")[0] + "://***",
-                "pool_size": (
-                    async_engine.pool.size()
-                    if hasattr(async_engine.pool, "size")
-                    else "N/A"
-                ),
-            }
+        tables = await _get_table_names()
+
+        return {
+            "tables": tables,
+            "table_count": len(tables),
+            "database_url": settings.DATABASE_URL.split("://")[0] + "://***",
+            "pool_size": (
+                async_engine.pool.size()
+                if hasattr(async_engine.pool, "size")
+                else "N/A"
+            ),
+        }
     except Exception as e:
         return {
             "error": str(e),
@@ -0,0 +1,35 @@
+"""
+🛡️ Video Streaming Backend Rate Limiting
+slowapi limiter with counters shared across workers in Redis
+"""
+
+from urllib.parse import urlsplit, urlunsplit
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.core.config import settings
+
+
+def _storage_uri() -> str:
+    """Build the limits storage URI from the Redis settings"""
+    parts = urlsplit(settings.REDIS_URL)
+    netloc = parts.netloc
+    if settings.REDIS_PASSWORD and "@" not in netloc:
+        netloc = f":{settings.REDIS_PASSWORD}@{netloc}"
+    path = parts.path if parts.path.strip("/") else f"/{settings.REDIS_DB}"
+    return urlunsplit((parts.scheme, netloc, path, parts.query, parts.fragment))
+
+
+# Defined at import so routes can be decorated; middleware is added only when enabled
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=[
+        f"{settings.RATE_LIMIT_REQUESTS}/{settings.RATE_LIMIT_PERIOD} seconds"
+    ],
+    storage_uri=_storage_uri(),
+    # Keep serving (with per-process counters) if Redis goes away
+    in_memory_fallback_enabled=True,
+    swallow_errors=True,
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
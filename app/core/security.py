@@ -3,18 +3,60 @@
 JWT authentication, password hashing, and security utilities
 """
 
+import asyncio
+import os
+import re
 import secrets
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Union
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional, Union
 
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+from cachetools import TTLCache
+import jwt
+import orjson
+from jwt import InvalidTokenError, PyJWS
 
 from app.core.config import settings
 
-# 🔐 Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 🔍 Precompiled validation patterns
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_FILENAME_BAD = re.compile(r'[<>:"/\\|?*]')
+
+# ⏱️ Token lifetimes (seconds) and signing key, resolved once
+_ACCESS_TTL = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TTL = settings.JWT_REFRESH_TOKEN_EXPIRE_MINUTES * 60
+_PRESIGNED_TTL = 3600  # 1 hour default
+_JWT_KEY = settings.JWT_SECRET_KEY.encode()
+_JWS = PyJWS()
+
+
+def _expires_at(expires_delta: Optional[timedelta], default_ttl: int) -> int:
+    """Compute an integer NumericDate expiry"""
+    ttl = int(expires_delta.total_seconds()) if expires_delta else default_ttl
+    return int(time.time()) + ttl
+
+
+# 🧵 Dedicated pool for bcrypt so logins don't starve the default executor
+password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 4, thread_name_prefix="bcrypt"
+)
+
+
+async def run_password_work(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a bcrypt-bound callable on the password executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, func, *args)
+
+
+def _encode_token(claims: Dict[str, Any]) -> str:
+    """Sign claims serialized with orjson instead of stdlib json"""
+    return _JWS.encode(orjson.dumps(claims), _JWT_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
 class SecurityManager:
@@ -23,29 +65,29 @@ class SecurityManager:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+        try:
+            return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        except ValueError:
+            # Malformed hash
+            return False
 
     @staticmethod
     def get_password_hash(password: str) -> str:
         """Hash a password"""
-        return pwd_context.hash(password)
+        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode(), salt).decode()
 
     @staticmethod
     def create_access_token(
         subject: Union[str, Any], expires_delta: Optional[timedelta] = None
     ) -> str:
         """Create JWT access token"""
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
-            )
-
-        to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-        encoded_jwt = jwt.encode(
-            to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-        )
+        to_encode = {
+            "exp": _expires_at(expires_delta, _ACCESS_TTL),
+            "sub": str(subject),
+            "type": "access",
+        }
+        encoded_jwt = _encode_token(to_encode)
         return encoded_jwt
 
     @staticmethod
@@ -53,28 +95,34 @@ class SecurityManager:
         subject: Union[str, Any], expires_delta: Optional[timedelta] = None
     ) -> str:
         """Create JWT refresh token"""
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(
-                minutes=settings.JWT_REFRESH_TOKEN_EXPIRE_MINUTES
-            )
-
-        to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-        encoded_jwt = jwt.encode(
-            to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-        )
+        to_encode = {
+            "exp": _expires_at(expires_delta, _REFRESH_TTL),
+            "sub": str(subject),
+            "type": "refresh",
+        }
+        encoded_jwt = _encode_token(to_encode)
         return encoded_jwt
 
     @staticmethod
     def verify_token(token: str) -> Dict[str, Any]:
         """Verify and decode JWT token"""
         try:
+            # Reject unexpected algorithms (e.g. "none") before any signature work
+            if jwt.get_unverified_header(token).get("alg") != settings.JWT_ALGORITHM:
+                raise InvalidTokenError("Disallowed token algorithm")
+
             payload = jwt.decode(
-                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+                token,
+                _JWT_KEY,
+                algorithms=[settings.JWT_ALGORITHM],
+                options={"require": ["exp", "sub"]},
             )
+
+            if "type" not in payload:
+                raise InvalidTokenError("Missing token type")
+
             return payload
-        except JWTError:
+        except InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
@@ -89,9 +137,6 @@ class SecurityManager:
     @staticmethod
     def generate_secure_filename(original_filename: str) -> str:
         """Generate a secure filename"""
-        import os
-        import uuid
-
         # Get file extension
         _, ext = os.path.splitext(original_filename)
 
@@ -101,12 +146,13 @@ class SecurityManager:
         return f"{secure_name}{ext}"
 
     @staticmethod
-    def validate_file_type(filename: str, allowed_extensions: list) -> bool:
-        """Validate file type by extension"""
-        import os
-
-        _, ext = os.path.splitext(filename.lower())
-        return ext in [e.lower() for e in allowed_extensions]
+    def validate_file_type(
+        filename: str, allowed_extensions: Optional[FrozenSet[str]] = None
+    ) -> bool:
+        """Validate file type against a set of lowercased extensions"""
+        if allowed_extensions is None:
+            allowed_extensions = settings.allowed_video_extensions
+        return os.path.splitext(filename)[1].lower() in allowed_extensions
 
     @staticmethod
     def validate_file_size(file_size: int, max_size: int) -> bool:
@@ -120,30 +166,21 @@ class SecurityManager:
         expires_delta: Optional[timedelta] = None,
     ) -> str:
         """Create presigned URL token for video access"""
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(hours=1)  # 1 hour default
-
         to_encode = {
-            "exp": expire,
+            "exp": _expires_at(expires_delta, _PRESIGNED_TTL),
             "video_id": video_id,
             "user_id": user_id,
             "type": "video_access",
         }
 
-        encoded_jwt = jwt.encode(
-            to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-        )
+        encoded_jwt = _encode_token(to_encode)
         return encoded_jwt
 
     @staticmethod
     def verify_presigned_url_token(token: str) -> Dict[str, Any]:
         """Verify presigned URL token"""
         try:
-            payload = jwt.decode(
-                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = jwt.decode(token, _JWT_KEY, algorithms=[settings.JWT_ALGORITHM])
 
             if payload.get("type") != "video_access":
                 raise HTTPException(
@@ -152,7 +189,7 @@ class SecurityManager:
                 )
 
             return payload
-        except JWTError:
+        except InvalidTokenError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired video access token",
@@ -161,31 +198,35 @@ class SecurityManager:
 
 # 🛡️ Rate Limiting
 class RateLimiter:
-    """Rate limiting utilities"""
+    """Sliding-window rate limiting utilities"""
 
-    def __init__(self):
-        self.requests = {}
+    def __init__(self, max_identifiers: int = 100_000, ttl: Optional[int] = None):
+        # Identifiers idle for longer than the window are evicted automatically
+        self.requests: TTLCache = TTLCache(
+            maxsize=max_identifiers, ttl=ttl or settings.RATE_LIMIT_PERIOD * 2
+        )
 
     def is_allowed(self, identifier: str, max_requests: int, window: int) -> bool:
         """Check if request is allowed within rate limit"""
-        now = datetime.utcnow()
+        now = time.monotonic()
 
-        if identifier not in self.requests:
-            self.requests[identifier] = []
+        timestamps = self.requests.get(identifier)
+        if timestamps is None or timestamps.maxlen != max_requests:
+            timestamps = deque(maxlen=max_requests)
+        # Re-set on every hit so the entry's TTL counts from the latest request
+        self.requests[identifier] = timestamps
 
-        # Clean old requests
-        self.requests[identifier] = [
-            req_time
-            for req_time in self.requests[identifier]
-            if (now - req_time).total_seconds() < window
-        ]
+        # Drop timestamps that fell out of the window
+        cutoff = now - window
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
 
         # Check if limit exceeded
-        if len(self.requests[identifier]) >= max_requests:
+        if len(timestamps) >= max_requests:
             return False
 
         # Add current request
-        self.requests[identifier].append(now)
+        timestamps.append(now)
         return True
 
     def get_remaining_requests(self, identifier: str, max_requests: int) -> int:
@@ -238,41 +279,82 @@ class PermissionManager:
         """Check if user can manage other users"""
         return user_level >= PermissionManager.SUPER_ADMIN
 
+    @staticmethod
+    def get_capabilities(level: int) -> Dict[str, Any]:
+        """Get precomputed permission summary for a level"""
+        capabilities = PERMISSION_CAPABILITIES.get(level)
+        if capabilities is None:
+            capabilities = PermissionManager._build_capabilities(level)
+        return capabilities
+
+    @staticmethod
+    def _build_capabilities(level: int) -> Dict[str, Any]:
+        return {
+            "permission_name": PermissionManager.get_permission_name(level),
+            "can_upload_videos": PermissionManager.can_upload_video(level),
+            "can_delete_videos": PermissionManager.can_delete_video(level),
+            "can_manage_users": PermissionManager.can_manage_users(level),
+        }
+
+
+# Capabilities for every known level, built once at import
+PERMISSION_CAPABILITIES = {
+    level: PermissionManager._build_capabilities(level)
+    for level in PermissionManager.PERMISSION_NAMES
+}
+
 
 # 🔐 Security Headers
+_SECURITY_HEADERS = MappingProxyType(
+    {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+        "Content-Security-Policy": "default-src 'self'; script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://unpkg.com; style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://unpkg.com; img-src 'self' data: https:; font-src 'self' https://fonts.gstatic.com; connect-src 'self';",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+    }
+)
+
+
 class SecurityHeaders:
     """Security headers configuration"""
 
     @staticmethod
-    def get_security_headers() -> Dict[str, str]:
-        """Get security headers"""
-        return {
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-            "Content-Security-Policy": "default-src 'self'; script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://unpkg.com; style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net https://unpkg.com; img-src 'self' data: https:; font-src 'self' https://fonts.gstatic.com; connect-src 'self';",
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-        }
+    def get_security_headers() -> Mapping[str, str]:
+        """Get security headers (shared read-only mapping)"""
+        return _SECURITY_HEADERS
 
 
 # 🔒 Input Validation
 class InputValidator:
     """Input validation utilities"""
 
+    _SPECIAL_CHARS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+    # Character class bit -> error shown when the class is missing
+    _HAS_UPPER, _HAS_LOWER, _HAS_DIGIT, _HAS_SPECIAL = 1, 2, 4, 8
+    _CLASS_ERRORS = (
+        (_HAS_UPPER, "Password must contain at least one uppercase letter"),
+        (_HAS_LOWER, "Password must contain at least one lowercase letter"),
+        (_HAS_DIGIT, "Password must contain at least one number"),
+        (_HAS_SPECIAL, "Password must contain at least one special character"),
+    )
+
     @staticmethod
     def validate_email(email: str) -> bool:
         """Validate email format"""
-        import re
-
-        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        return re.match(pattern, email) is not None
+        # Cheap structural reject before touching the regex engine
+        if len(email) > 254:
+            return False
+        at = email.find("@")
+        if at < 1 or "." not in email[at + 1 :]:
+            return False
+        return _EMAIL_RE.match(email) is not None
 
     @staticmethod
     def validate_password_strength(password: str) -> Dict[str, Any]:
         """Validate password strength"""
-        import re
-
         result = {"is_valid": True, "errors": [], "score": 0}
 
         # Length check
@@ -282,53 +364,36 @@ class InputValidator:
         else:
             result["score"] += 1
 
-        # Uppercase check
-        if not re.search(r"[A-Z]", password):
-            result["errors"].append(
-                "Password must contain at least one uppercase letter"
-            )
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
-
-        # Lowercase check
-        if not re.search(r"[a-z]", password):
-            result["errors"].append(
-                "Password must contain at least one lowercase letter"
-            )
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
-
-        # Number check
-        if not re.search(r"\d", password):
-            result["errors"].append("Password must contain at least one number")
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
-
-        # Special character check
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-            result["errors"].append(
-                "Password must contain at least one special character"
-            )
-            result["is_valid"] = False
-        else:
-            result["score"] += 1
+        # Character class checks in a single pass
+        cls = InputValidator
+        flags = 0
+        for c in password:
+            if "A" <= c <= "Z":
+                flags |= cls._HAS_UPPER
+            elif "a" <= c <= "z":
+                flags |= cls._HAS_LOWER
+            elif c.isdecimal():
+                flags |= cls._HAS_DIGIT
+            elif c in cls._SPECIAL_CHARS:
+                flags |= cls._HAS_SPECIAL
+
+        for bit, error in cls._CLASS_ERRORS:
+            if flags & bit:
+                result["score"] += 1
+            else:
+                result["errors"].append(error)
+                result["is_valid"] = False
 
         return result
 
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """Sanitize filename for security"""
-        import os
-        import re
-
         # Remove path separators
         filename = os.path.basename(filename)
 
         # Remove dangerous characters
-        filename = re.sub(r'[<>:"/\\|?*]', "_", filename)
+        filename = _FILENAME_BAD.sub("_", filename)
 
         # Limit length
         if len(filename) > 255:
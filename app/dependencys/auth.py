@@ -1,8 +1,8 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from app.core.security import PermissionManager, SecurityManager
-from app.services.auth import ADMIN_USERS, AuthService
+from app.core.security import PermissionManager
+from app.services.auth import AuthService
 
 # Security scheme
 security = HTTPBearer()
@@ -15,7 +15,7 @@ async def get_current_user(
     """Get current authenticated user"""
     try:
         # Verify token
-        payload = SecurityManager.verify_token(credentials.credentials)
+        payload = AuthService.verify_and_cache(credentials.credentials)
         username = payload.get("sub")
         token_type = payload.get("type", "access")
 
@@ -1,8 +1,11 @@
+from functools import lru_cache
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_async_db
+from app.services.minio_service import MinIOService
 from app.services.video_service import (
     VideoAnalyticsService,
     VideoSearchService,
@@ -10,9 +13,18 @@ from app.services.video_service import (
 )
 
 
+# Process-wide MinIO client (keeps the urllib3 connection pool warm)
+@lru_cache()
+def get_minio_service() -> MinIOService:
+    return MinIOService()
+
+
 # Dependency for video service
-async def get_video_service(db: AsyncSession = Depends(get_async_db)) -> VideoService:
-    return VideoService(db)
+async def get_video_service(
+    db: AsyncSession = Depends(get_async_db),
+    minio_service: MinIOService = Depends(get_minio_service),
+) -> VideoService:
+    return VideoService(db, minio_service)
 
 
 async def get_analytics_service(
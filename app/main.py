@@ -4,59 +4,130 @@ Entry point for the video streaming service
 """
 
 import asyncio
+import logging
 import os
+import queue
+import time
+from collections import defaultdict
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Awaitable, Callable, Dict, Tuple
 
+import orjson
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIASGIMiddleware
 
 from app.api.auth import router as auth_router
 from app.api.videos import router as videos_router
+from app.core.cache import init_cache
 from app.core.config import settings
 from app.core.database import health_check as db_health_check, init_database
-from app.core.security import SecurityHeaders
-from app.services.minio_service import MinIOService
+from app.core.rate_limit import limiter
+from app.core.middleware import (
+    AccessLogMiddleware,
+    CompressionMiddleware,
+    SecurityHeadersMiddleware,
+)
+from app.core.security import password_executor, run_password_work
+from app.dependencys.videos import get_minio_service
+from app.services.auth import warm_user_store
+from app.services.minio_service import storage_executor
+from app.services.video_service import (
+    run_progress_buffer_flusher,
+    run_view_buffer_flusher,
+)
+
+logging.basicConfig(
+    level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s"
+)
+logger = logging.getLogger("app")
+
+# Handlers write on a listener thread; request paths only enqueue the record
+_root_logger = logging.getLogger()
+log_listener = QueueListener(
+    queue.SimpleQueue(), *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [QueueHandler(log_listener.queue)]
+log_listener.start()
+
+
+def _create_runtime_dirs():
+    """Create directories the app writes to"""
+    for directory in ("logs", "tmp", "uploads"):
+        os.makedirs(directory, exist_ok=True)
+
+
+async def _check_minio(app: FastAPI) -> dict:
+    """Create the shared MinIO client and check it"""
+    minio_service = get_minio_service()
+    app.state.minio = minio_service
+    return await minio_service.health_check()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
-    print("🚀 Starting Video Streaming Backend...")
-
-    # Create necessary directories
-    os.makedirs("logs", exist_ok=True)
-    os.makedirs("tmp", exist_ok=True)
-    os.makedirs("uploads", exist_ok=True)
+    logger.info("🚀 Starting Video Streaming Backend...")
+
+    # Create necessary directories (blocking filesystem calls, off the loop)
+    await asyncio.to_thread(_create_runtime_dirs)
+
+    # Database, response cache, MinIO and the user store (bcrypt, on the password
+    # pool rather than the event loop) are independent - set them up together
+    db_success, cache_result, health, users_result = await asyncio.gather(
+        init_database(),
+        init_cache(),
+        _check_minio(app),
+        run_password_work(warm_user_store),
+        return_exceptions=True,
+    )
 
-    # Initialize database
-    db_success = await init_database()
-    if not db_success:
-        print("❌ Failed to initialize database")
+    if db_success is not True:
+        logger.error("❌ Failed to initialize database")
         exit(1)
 
-    # Initialize MinIO
-    try:
-        minio_service = MinIOService()
-        health = await minio_service.health_check()
-        if health["status"] == "healthy":
-            print("✅ MinIO connection established")
-        else:
-            print(f"⚠️ MinIO connection issues: {health}")
-    except Exception as e:
-        print(f"❌ MinIO initialization failed: {e}")
+    if isinstance(cache_result, Exception):
+        logger.error("❌ Response cache initialization failed: %s", cache_result)
+    else:
+        logger.info("✅ Response cache initialized")
+
+    if isinstance(users_result, Exception):
+        logger.error("❌ User store initialization failed: %s", users_result)
+
+    if isinstance(health, Exception):
+        logger.error("❌ MinIO initialization failed: %s", health)
+    elif health["status"] == "healthy":
+        logger.info("✅ MinIO connection established")
+    else:
+        logger.warning("⚠️ MinIO connection issues: %s", health)
 
-    print("✅ Application startup complete")
+    # Start batched view recording
+    view_flusher = asyncio.create_task(run_view_buffer_flusher())
+    progress_flusher = asyncio.create_task(run_progress_buffer_flusher())
+
+    logger.info("✅ Application startup complete")
 
     yield
 
     # Shutdown
-    print("🔄 Shutting down Video Streaming Backend...")
-    print("✅ Application shutdown complete")
+    logger.info("🔄 Shutting down Video Streaming Backend...")
+    for flusher in (view_flusher, progress_flusher):
+        flusher.cancel()
+        try:
+            await flusher
+        except asyncio.CancelledError:
+            pass
+    password_executor.shutdown(wait=False)
+    storage_executor.shutdown(wait=False)
+    logger.info("✅ Application shutdown complete")
+    log_listener.stop()
 
 
 # Create FastAPI application
@@ -67,28 +138,24 @@ app = FastAPI(
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
 # Security headers middleware
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    """Add security headers to all responses"""
-    response = await call_next(request)
+app.add_middleware(SecurityHeadersMiddleware)
 
-    # Add security headers
-    security_headers = SecurityHeaders.get_security_headers()
-    for header, value in security_headers.items():
-        response.headers[header] = value
 
-    return response
+# Response compression (level 1: most of the size win for little CPU)
+app.add_middleware(CompressionMiddleware, minimum_size=1024, compresslevel=1)
 
 
 # CORS middleware
 if settings.ENABLE_CORS:
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.allowed_hosts,
+        # Set membership per preflight instead of a list scan
+        allow_origins=frozenset(settings.allowed_hosts),
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         allow_headers=["*"],
@@ -97,77 +164,96 @@ if settings.ENABLE_CORS:
 
 # Trusted host middleware (production)
 if settings.is_production:
-    app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.allowed_hosts)
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.trusted_hosts)
 
 
 # Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all requests"""
-    if settings.ENABLE_LOGGING:
-        start_time = asyncio.get_event_loop().time()
-
-        response = await call_next(request)
-
-        process_time = asyncio.get_event_loop().time() - start_time
-        print(
-            f"{request.method} {request.url.path} - {response.status_code} - {process_time:.3f}s"
-        )
-
-        # Add process time header
-        response.headers["X-Process-Time"] = str(process_time)
-
-        return response
-    else:
-        return await call_next(request)
+if settings.ENABLE_LOGGING:
+    app.add_middleware(AccessLogMiddleware)
+    # Our middleware logs every request; skip uvicorn's duplicate line
+    logging.getLogger("uvicorn.access").disabled = True
 
 
-# Include routers
+# Include routers (routes are matched in order; the busiest prefix goes first)
 app.include_router(
-    auth_router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"]
+    videos_router, prefix=f"{settings.API_V1_STR}/videos", tags=["videos"]
 )
 
 app.include_router(
-    videos_router, prefix=f"{settings.API_V1_STR}/videos", tags=["videos"]
+    auth_router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"]
 )
 
 
 # Health check endpoints
+_LIVENESS_BODY = b'{"status":"ok"}'
+
+
+@app.get("/healthz")
+@limiter.exempt
+async def liveness():
+    """Liveness probe - process is up, no dependency checks"""
+    return Response(content=_LIVENESS_BODY, media_type="application/json")
+
+
+# key -> (checked_at, payload); probes within HEALTH_CACHE_TTL reuse the last result
+_health_cache: Dict[str, Tuple[float, Any]] = {}
+_health_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+async def _cached_health(key: str, check: Callable[[], Awaitable[Any]]) -> Any:
+    """Run a health check at most once per HEALTH_CACHE_TTL"""
+    entry = _health_cache.get(key)
+    if entry and time.monotonic() - entry[0] < settings.HEALTH_CACHE_TTL:
+        return entry[1]
+
+    # Concurrent probes wait for one in-flight check instead of stampeding
+    async with _health_locks[key]:
+        entry = _health_cache.get(key)
+        if entry and time.monotonic() - entry[0] < settings.HEALTH_CACHE_TTL:
+            return entry[1]
+
+        payload = await check()
+        _health_cache[key] = (time.monotonic(), payload)
+        return payload
+
+
+async def _check_services() -> dict:
+    """Check database and MinIO concurrently"""
+    db_health, storage_health = await asyncio.gather(
+        db_health_check(), get_minio_service().health_check()
+    )
+
+    # Overall status
+    overall_status = (
+        "healthy"
+        if (
+            db_health["status"] == "healthy"
+            and storage_health["status"] == "healthy"
+        )
+        else "unhealthy"
+    )
+
+    return {
+        "status": overall_status,
+        "timestamp": asyncio.get_running_loop().time(),
+        "version": settings.APP_VERSION,
+        "environment": settings.ENVIRONMENT,
+        "services": {"database": db_health, "storage": storage_health},
+    }
+
+
 @app.get("/health")
 async def health_check():
     """General health check"""
     try:
-        # Check database
-        db_health = await db_health_check()
-
-        # Check MinIO
-        minio_service = MinIOService()
-        storage_health = await minio_service.health_check()
-
-        # Overall status
-        overall_status = (
-            "healthy"
-            if (
-                db_health["status"] == "healthy"
-                and storage_health["status"] == "healthy"
-            )
-            else "unhealthy"
-        )
-
-        return {
-            "status": overall_status,
-            "timestamp": asyncio.get_event_loop().time(),
-            "version": settings.APP_VERSION,
-            "environment": settings.ENVIRONMENT,
-            "services": {"database": db_health, "storage": storage_health},
-        }
+        return await _cached_health("overall", _check_services)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": asyncio.get_event_loop().time(),
+                "timestamp": asyncio.get_running_loop().time(),
             },
         )
 
@@ -175,21 +261,19 @@ async def health_check():
 @app.get("/health/database")
 async def database_health():
     """Database-specific health check"""
-    return await db_health_check()
+    return await _cached_health("database", db_health_check)
 
 
 @app.get("/health/storage")
 async def storage_health():
     """Storage-specific health check"""
-    minio_service = MinIOService()
-    return await minio_service.health_check()
+    return await _cached_health("storage", get_minio_service().health_check)
 
 
 # Root endpoint
-@app.get("/")
-async def root():
-    """Root endpoint with API information"""
-    return {
+# Static payloads: settings never change after startup, so encode them once
+_ROOT_BYTES = orjson.dumps(
+    {
         "message": f"🎬 {settings.APP_NAME} v{settings.APP_VERSION}",
         "description": "Secure video streaming backend with FastAPI",
         "docs_url": (
@@ -210,13 +294,10 @@ async def root():
             "max_concurrent_uploads": settings.MAX_CONCURRENT_UPLOADS,
         },
     }
+)
 
-
-# API information
-@app.get(f"{settings.API_V1_STR}/info")
-async def api_info():
-    """API information and capabilities"""
-    return {
+_API_INFO_BYTES = orjson.dumps(
+    {
         "api_version": "v1",
         "endpoints": {
             "authentication": f"{settings.API_V1_STR}/auth/",
@@ -238,13 +319,27 @@ async def api_info():
             "search": settings.ENABLE_VIDEO_SEARCH,
         },
     }
+)
+
+
+@app.get("/")
+async def root():
+    """Root endpoint with API information"""
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
+
+# API information
+@app.get(f"{settings.API_V1_STR}/info")
+async def api_info():
+    """API information and capabilities"""
+    return Response(content=_API_INFO_BYTES, media_type="application/json")
 
 
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc):
     """Custom 404 handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={
             "error": "Not Found",
@@ -257,7 +352,7 @@ async def not_found_handler(request: Request, exc):
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc):
     """Custom 500 handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
@@ -267,14 +362,10 @@ async def internal_error_handler(request: Request, exc):
     )
 
 
-# Rate limiting (if enabled)
+# Rate limiting (if enabled): default limits apply to every non-exempt route
+app.state.limiter = limiter
 if settings.RATE_LIMIT_ENABLED:
-    from slowapi import Limiter, _rate_limit_exceeded_handler
-    from slowapi.errors import RateLimitExceeded
-    from slowapi.util import get_remote_address
-
-    limiter = Limiter(key_func=get_remote_address)
-    app.state.limiter = limiter
+    app.add_middleware(SlowAPIASGIMiddleware)
     app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # Development server
@@ -283,6 +374,9 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
+        # Fail loudly instead of silently falling back to asyncio + h11
+        loop="uvloop",
+        http="httptools",
         reload=settings.AUTO_RELOAD and settings.is_development,
         log_level=settings.LOG_LEVEL.lower(),
         access_log=settings.ENABLE_LOGGING,
@@ -9,19 +9,30 @@ from enum import Enum
 from typing import Optional
 
 from sqlalchemy import (
+    DDL,
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    Uuid,
+    event,
+    text,
 )
 from sqlalchemy.orm import relationship
 
-from app.core.database import Base
+from app.core.database import Base, utcnow
+
+# 16-byte native UUID on PostgreSQL, exposed to Python as str. Other backends keep
+# the dashed String(36) ids existing rows were written with (non-native Uuid would
+# bind 32-char hex and stop matching them)
+UUID_STR = String(36).with_variant(Uuid(as_uuid=False), "postgresql")
 
 
 class VideoStatus(str, Enum):
@@ -51,9 +62,23 @@ class Video(Base):
     """Video model for storing video metadata and information"""
 
     __tablename__ = "videos"
+    __table_args__ = (
+        # Listing: filter by status, newest first (id breaks ties for keyset pages)
+        Index("ix_videos_status_created_id", "status", "created_at", "id"),
+        # Popular/recommended: completed videos by view count
+        Index("ix_videos_status_views", "status", "view_count"),
+        Index("ix_videos_public_featured", "is_public", "is_featured"),
+        # Storage totals only sum completed videos
+        Index(
+            "ix_videos_completed_size",
+            "file_size",
+            postgresql_where=text("status = 'completed'"),
+            sqlite_where=text("status = 'completed'"),
+        ),
+    )
 
     # Primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUID_STR, primary_key=True, default=lambda: str(uuid.uuid4()))
 
     # Basic video information
     title = Column(String(200), nullable=False, index=True)
@@ -63,7 +88,7 @@ class Video(Base):
 
     # File information
     file_path = Column(String(500), nullable=False)
-    file_size = Column(Integer, nullable=False)  # in bytes
+    file_size = Column(BigInteger, nullable=False)  # in bytes
     file_type = Column(String(50), nullable=False)
     file_extension = Column(String(10), nullable=False)
 
@@ -72,7 +97,7 @@ class Video(Base):
     width = Column(Integer, nullable=True)
     height = Column(Integer, nullable=True)
     fps = Column(Float, nullable=True)
-    bitrate = Column(Integer, nullable=True)
+    bitrate = Column(BigInteger, nullable=True)
     codec = Column(String(50), nullable=True)
 
     # Processing status
@@ -100,17 +125,23 @@ class Video(Base):
     )  # List of available quality versions
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False, index=True)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     uploaded_at = Column(DateTime, nullable=True)
     processed_at = Column(DateTime, nullable=True)
 
-    # Relationships
+    # Relationships (lazy="raise": load explicitly with selectinload/joinedload)
     upload_sessions = relationship(
-        "VideoUploadSession", back_populates="video", cascade="all, delete-orphan"
+        "VideoUploadSession",
+        back_populates="video",
+        cascade="all, delete-orphan",
+        lazy="raise",
     )
     view_sessions = relationship(
-        "VideoViewSession", back_populates="video", cascade="all, delete-orphan"
+        "VideoViewSession",
+        back_populates="video",
+        cascade="all, delete-orphan",
+        lazy="raise",
     )
 
     def __repr__(self):
@@ -161,10 +192,10 @@ class VideoUploadSession(Base):
     __tablename__ = "video_upload_sessions"
 
     # Primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUID_STR, primary_key=True, default=lambda: str(uuid.uuid4()))
 
     # Foreign key to video
-    video_id = Column(String, ForeignKey("videos.id"), nullable=False)
+    video_id = Column(UUID_STR, ForeignKey("videos.id"), nullable=False)
 
     # Upload information
     session_token = Column(String(255), nullable=False, unique=True)
@@ -174,7 +205,7 @@ class VideoUploadSession(Base):
     uploaded_chunks = Column(Integer, default=0)
 
     # Progress tracking
-    bytes_uploaded = Column(Integer, default=0)
+    bytes_uploaded = Column(BigInteger, default=0)
     upload_progress = Column(Float, default=0.0)  # 0.0 - 100.0
     upload_speed = Column(Float, nullable=True)  # bytes per second
 
@@ -183,13 +214,13 @@ class VideoUploadSession(Base):
     error_message = Column(Text, nullable=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
 
     # Relationships
-    video = relationship("Video", back_populates="upload_sessions")
+    video = relationship("Video", back_populates="upload_sessions", lazy="raise")
 
     def __repr__(self):
         return f"<VideoUploadSession(id={self.id}, video_id={self.video_id}, progress={self.upload_progress}%)>"
@@ -223,12 +254,18 @@ class VideoViewSession(Base):
     """Video view session for tracking user viewing progress"""
 
     __tablename__ = "video_view_sessions"
+    __table_args__ = (
+        # Resume lookups and view dedupe hit (video_id, session_id)
+        Index("ix_view_sessions_video_session", "video_id", "session_id"),
+        # Per-video stats and analytics aggregate over a created_at range
+        Index("ix_view_sessions_video_created", "video_id", "created_at"),
+    )
 
     # Primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUID_STR, primary_key=True, default=lambda: str(uuid.uuid4()))
 
     # Foreign key to video
-    video_id = Column(String, ForeignKey("videos.id"), nullable=False)
+    video_id = Column(UUID_STR, ForeignKey("videos.id"), nullable=False)
 
     # User information (optional for anonymous viewing)
     user_id = Column(String, nullable=True)
@@ -252,12 +289,12 @@ class VideoViewSession(Base):
     paused_at = Column(Float, nullable=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_accessed = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
+    last_accessed = Column(DateTime, server_default=utcnow())
 
     # Relationships
-    video = relationship("Video", back_populates="view_sessions")
+    video = relationship("Video", back_populates="view_sessions", lazy="raise")
 
     def __repr__(self):
         return f"<VideoViewSession(id={self.id}, video_id={self.video_id}, progress={self.completion_percentage}%)>"
@@ -288,15 +325,20 @@ class VideoAnalytics(Base):
     """Video analytics for tracking performance and usage"""
 
     __tablename__ = "video_analytics"
+    __table_args__ = (
+        Index("ix_video_analytics_video_date", "video_id", "date"),
+        # Monthly partitions on PostgreSQL, created ahead by ensure_analytics_partitions
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
 
-    # Primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Primary key (includes the partition key, as PostgreSQL requires)
+    id = Column(UUID_STR, primary_key=True, default=lambda: str(uuid.uuid4()))
+    date = Column(DateTime, primary_key=True, nullable=False, server_default=utcnow())
 
     # Foreign key to video
-    video_id = Column(String, ForeignKey("videos.id"), nullable=False)
+    video_id = Column(UUID_STR, ForeignKey("videos.id"), nullable=False)
 
     # Analytics data
-    date = Column(DateTime, nullable=False, default=datetime.utcnow)
     views_count = Column(Integer, default=0)
     unique_viewers = Column(Integer, default=0)
     total_watch_time = Column(Float, default=0.0)  # in seconds
@@ -320,8 +362,19 @@ class VideoAnalytics(Base):
     browser_stats = Column(JSON, nullable=True)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow(), nullable=False)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
     def __repr__(self):
         return f"<VideoAnalytics(id={self.id}, video_id={self.video_id}, views={self.views_count})>"
+
+
+# Rows outside every monthly partition land here instead of failing the INSERT
+event.listen(
+    VideoAnalytics.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS video_analytics_default "
+        "PARTITION OF video_analytics DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
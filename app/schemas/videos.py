@@ -3,10 +3,12 @@
 Data validation and serialization schemas for video operations
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, validator
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 # Base schemas
@@ -52,26 +54,14 @@ class VideoResponse(BaseModel):
     updated_at: datetime
     uploaded_at: Optional[datetime] = None
     processed_at: Optional[datetime] = None
-    resolution: Optional[str] = None
+    # Read from Video.resolution ("WxH" or "Unknown") via from_attributes
+    resolution: Optional[str] = "Unknown"
     file_type: Optional[str] = None
     tags: Optional[List[str]] = None
     is_public: bool = False
     is_featured: bool = False
 
-    class Config:
-        from_attributes = True
-
-    @validator("resolution", pre=True, always=True)
-    def format_resolution(cls, v, values):
-        """Format resolution from width and height"""
-        if hasattr(values.get("width"), "__class__") and hasattr(
-            values.get("height"), "__class__"
-        ):
-            width = getattr(values, "width", None)
-            height = getattr(values, "height", None)
-            if width and height:
-                return f"{width}x{height}"
-        return v or "Unknown"
+    model_config = ConfigDict(from_attributes=True)
 
 
 class VideoListResponse(BaseModel):
@@ -81,20 +71,41 @@ class VideoListResponse(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
+    # Stored, not computed: cached pages are re-validated from JSON and a cursor
+    # page can't rebuild has_prev from page/per_page
     has_next: bool = False
     has_prev: bool = False
 
-    @validator("has_next", pre=True, always=True)
-    def calculate_has_next(cls, v, values):
-        total = values.get("total", 0)
-        page = values.get("page", 1)
-        per_page = values.get("per_page", 10)
-        return (page * per_page) < total
-
-    @validator("has_prev", pre=True, always=True)
-    def calculate_has_prev(cls, v, values):
-        page = values.get("page", 1)
-        return page > 1
+    @classmethod
+    def dump_bytes(
+        cls,
+        videos: List[VideoResponse],
+        total: int,
+        page: int,
+        per_page: int,
+        next_cursor: Optional[str] = None,
+        has_prev: Optional[bool] = None,
+    ) -> bytes:
+        """Encode a page straight to JSON, skipping model construction
+
+        Cursor pages have no page number, so the caller passes has_prev.
+        """
+        return orjson.dumps(
+            {
+                "videos": orjson.Fragment(_VIDEO_LIST_ADAPTER.dump_json(videos)),
+                "total": total,
+                "page": page,
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None or (page * per_page) < total,
+                "has_prev": page > 1 if has_prev is None else has_prev,
+            }
+        )
+
+
+# Built once; reused for every list page
+_VIDEO_LIST_ADAPTER = TypeAdapter(List[VideoResponse])
 
 
 class VideoUploadResponse(BaseModel):
@@ -129,8 +140,9 @@ class VideoProgressRequest(BaseModel):
     user_id: Optional[str] = Field(None, description="User ID (optional)")
 
 
-class VideoProgressResponse(BaseModel):
-    """Schema for video progress response"""
+@dataclass(slots=True)
+class VideoProgressResponse:
+    """Schema for video progress response (slotted DTO, sent on every ping)"""
 
     video_id: str
     current_time: float
@@ -139,6 +151,13 @@ class VideoProgressResponse(BaseModel):
     last_accessed: datetime
     is_completed: bool = False
 
+    def dump_bytes(self) -> bytes:
+        """Encode to JSON with the prebuilt adapter"""
+        return _PROGRESS_ADAPTER.dump_json(self)
+
+
+_PROGRESS_ADAPTER = TypeAdapter(VideoProgressResponse)
+
 
 # Analytics schemas
 class VideoStatsResponse(BaseModel):
@@ -261,7 +280,7 @@ class DashboardOverviewResponse(BaseModel):
     """Schema for dashboard overview"""
 
     summary: Dict[str, Any]
-    # top_videos: List[Dict[str, Any]]
+    top_videos: List[Dict[str, Any]]
     recent_uploads: List[VideoResponse]
     analytics: Dict[str, Any]
     period: str
@@ -1,46 +1,151 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from functools import cache
+from typing import Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
 
 from app.core.config import settings
 from app.core.security import PermissionManager, SecurityManager
 
-# Simple in-memory user store (replace with database in production)
-ADMIN_USERS = {
-    "admin": {
-        "id": "admin-001",
-        "username": "admin",
-        "email": settings.ADMIN_EMAIL,
-        "password_hash": SecurityManager.get_password_hash(settings.ADMIN_PASSWORD),
-        "role": "admin",
-        "permission_level": PermissionManager.ADMIN,
-        "is_active": True,
-        "created_at": datetime.utcnow(),
-    }
-}
+
+# Simple in-memory user store (replace with database in production).
+# Built once, under a lock, off the event loop (see warm_user_store) so importing
+# this module (every worker fork) skips bcrypt and concurrent first calls share it.
+_admin_store: Optional[Dict[str, dict]] = None
+_admin_store_lock = threading.Lock()
+
+
+def _admin_users() -> Dict[str, dict]:
+    global _admin_store
+    if _admin_store is None:
+        with _admin_store_lock:
+            if _admin_store is None:
+                password_hash = (
+                    settings.ADMIN_PASSWORD_HASH
+                    or SecurityManager.get_password_hash(settings.ADMIN_PASSWORD)
+                )
+                _admin_store = {
+                    "admin": {
+                        "id": "admin-001",
+                        "username": "admin",
+                        "email": settings.ADMIN_EMAIL,
+                        "password_hash": password_hash,
+                        "role": "admin",
+                        "permission_level": PermissionManager.ADMIN,
+                        "is_active": True,
+                        "created_at": datetime.utcnow(),
+                    }
+                }
+    return _admin_store
+
+
+# Verified against when the user is unknown, so both paths cost one bcrypt check
+@cache
+def _dummy_hash() -> str:
+    return SecurityManager.get_password_hash("dummy-password")
+
+
+def warm_user_store():
+    """Run the bcrypt work behind the user store (blocking; call on a thread)"""
+    _admin_users()
+    _dummy_hash()
+
+
+# Recent successful logins: (username, password_hash, keyed password digest).
+# Positive results only; the stored hash in the key drops entries on password change.
+_verify_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_verify_cache_lock = threading.Lock()  # authenticate_user runs on a thread pool
+_VERIFY_CACHE_KEY = secrets.token_bytes(32)  # per process; raw passwords never stored
+
+# Recently verified tokens: SHA-256(token)[:16] -> payload, so hot clients skip
+# signature checks. exp is re-checked on every hit.
+_jwt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+# Cached public view of the user store, rebuilt only after a mutation
+_users_view: Optional[List[dict]] = None
 
 
 class AuthService:
     """Authentication service"""
 
+    @staticmethod
+    def _verify_cache_key(user: dict, password: str) -> Tuple[str, str, bytes]:
+        digest = hmac.new(
+            _VERIFY_CACHE_KEY, password.encode(), hashlib.blake2b
+        ).digest()
+        return user["username"], user["password_hash"], digest
+
     @staticmethod
     def authenticate_user(username: str, password: str) -> Optional[dict]:
         """Authenticate user with username and password"""
-        user = ADMIN_USERS.get(username)
-        if not user:
-            return None
+        user = _admin_users().get(username)
 
-        if not SecurityManager.verify_password(password, user["password_hash"]):
+        if user:
+            cache_key = AuthService._verify_cache_key(user, password)
+            with _verify_cache_lock:
+                cached = _verify_cache.get(cache_key)
+            if cached:
+                return user if user["is_active"] else None
+
+        # Always run exactly one bcrypt check so unknown users cost the same
+        hashed = user["password_hash"] if user else _dummy_hash()
+        password_ok = SecurityManager.verify_password(password, hashed)
+        if not (user and password_ok):
             return None
 
+        with _verify_cache_lock:
+            _verify_cache[cache_key] = True
+
         if not user["is_active"]:
             return None
 
         return user
 
+    @staticmethod
+    def verify_and_cache(token: str) -> dict:
+        """Verify a JWT, reusing a recent verification while it is unexpired"""
+        key = hashlib.sha256(token.encode()).digest()[:16]
+        payload = _jwt_cache.get(key)
+        if payload is not None and payload["exp"] > time.time():
+            return payload
+
+        payload = SecurityManager.verify_token(token)
+        _jwt_cache[key] = payload
+        return payload
+
     @staticmethod
     def get_user_by_username(username: str) -> Optional[dict]:
         """Get user by username"""
-        return ADMIN_USERS.get(username)
+        return _admin_users().get(username)
+
+    @staticmethod
+    def list_users() -> List[dict]:
+        """Get public user records (cached until users change)"""
+        global _users_view
+        if _users_view is None:
+            _users_view = [
+                {
+                    "id": user_data["id"],
+                    "username": user_data["username"],
+                    "email": user_data["email"],
+                    "role": user_data["role"],
+                    "is_active": user_data["is_active"],
+                    "created_at": user_data["created_at"],
+                }
+                for user_data in _admin_users().values()
+            ]
+        return _users_view
+
+    @staticmethod
+    def invalidate_users_view():
+        """Drop the cached user list after a user record is modified"""
+        global _users_view
+        _users_view = None
 
     @staticmethod
     def create_tokens(user: dict) -> dict:
@@ -5,15 +5,121 @@ Handles file storage operations with MinIO object storage
 
 import asyncio
 import io
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from typing import BinaryIO, Optional, Union
-
+from functools import partial
+from itertools import islice
+from operator import attrgetter
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import certifi
+import urllib3
+from cachetools import LRUCache, TTLCache
 from fastapi import HTTPException, status
 from minio import Minio
+from minio.commonconfig import REPLACE, CopySource
+from minio.datatypes import Part
 from minio.error import S3Error
 
+from app.core.cache import get_redis
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Multipart uploads: objects larger than one part go up as parts sent in parallel
+MULTIPART_PART_SIZE = 16 * 1024 * 1024  # 16MB
+MULTIPART_PARALLEL_UPLOADS = 8
+# S3 limits: every part but the last must be >= 5MB, at most 10000 parts
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+MAX_MULTIPART_PARTS = 10_000
+# Abandoned chunked upload sessions expire from Redis after a day
+UPLOAD_SESSION_TTL = 24 * 60 * 60
+
+# One connection pool for every MinIOService in the process: connections (and TLS
+# sessions) are reused across instances and the pool size bounds buffered responses
+_HTTP = urllib3.PoolManager(
+    num_pools=10,
+    maxsize=64,
+    block=False,
+    cert_reqs="CERT_REQUIRED",
+    ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+    retries=urllib3.Retry(
+        total=3, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]
+    ),
+    timeout=urllib3.Timeout(connect=5, read=60),
+)
+
+# Recent HEAD results (info dict, or None when missing) so existence + info
+# checks in one request share a round trip. Cleared per name on local writes;
+# the short TTL bounds staleness from writes in other processes.
+_stat_cache: TTLCache = TTLCache(maxsize=10_000, ttl=2)
+_NOT_FOUND_CODES = frozenset({"NoSuchKey", "NoSuchObject", "ResourceNotFound"})
+
+# Fields list_files reports, fetched per object in one C-level call
+_LIST_FIELDS = attrgetter("object_name", "size", "last_modified", "etag", "is_dir")
+
+# Small hot objects (thumbnails, segments) by name -> (etag, body); a HEAD that
+# still matches the ETag serves them from memory. Bounded by total bytes.
+CONTENT_CACHE_BYTES = 64 * 1024 * 1024  # 64MB
+CONTENT_CACHE_MAX_OBJECT = 2 * 1024 * 1024  # larger objects are never cached
+_content_cache: LRUCache = LRUCache(
+    maxsize=CONTENT_CACHE_BYTES, getsizeof=lambda entry: len(entry[1])
+)
+
+# Blocking MinIO calls get their own threads instead of the shared default executor
+storage_executor = ThreadPoolExecutor(
+    max_workers=settings.MINIO_MAX_CONCURRENCY, thread_name_prefix="minio"
+)
+
+
+def _as_stream(
+    data: Union[bytes, BinaryIO], size: Optional[int] = None
+) -> Tuple[BinaryIO, int]:
+    """Wrap upload data as a stream plus its length, without reading it
+
+    Length is -1 when unknown, which makes minio-py stream it in parts.
+    """
+    if isinstance(data, bytes):
+        return io.BytesIO(data), len(data)
+    if size is not None:
+        return data, size
+
+    # Real files: size from the inode instead of seeking to the end
+    try:
+        return data, os.fstat(data.fileno()).st_size - data.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return data, -1
+
+
+class CountingReader:
+    """Read-through wrapper that counts the bytes handed to the uploader"""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def __getattr__(self, name: str) -> Any:
+        # fileno/tell/seek etc. come from the wrapped stream
+        return getattr(self.stream, name)
+
 
 class MinIOService:
     """MinIO storage service for video file management"""
@@ -25,9 +131,20 @@ class MinIOService:
             access_key=settings.MINIO_ACCESS_KEY,
             secret_key=settings.MINIO_SECRET_KEY,
             secure=settings.MINIO_SECURE,
+            # Known region: presigning never has to ask the server for it
+            region=settings.MINIO_REGION,
+            http_client=_HTTP,
         )
         self.bucket_name = settings.MINIO_BUCKET_NAME
         self._bucket_checked = False
+        # Caps queued + running calls so bursts wait here, not in the executor queue
+        self._sem = asyncio.Semaphore(settings.MINIO_MAX_CONCURRENCY)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking MinIO call on the storage executor"""
+        async with self._sem:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(storage_executor, func, *args)
 
     async def _ensure_bucket_exists(self):
         """Ensure the bucket exists, create if it doesn't"""
@@ -35,30 +152,12 @@ class MinIOService:
             return
 
         try:
-            # Run sync operation in thread pool
-            loop = asyncio.get_event_loop()
-
-            # Check if bucket exists
-            bucket_exists = await loop.run_in_executor(
-                None, self.client.bucket_exists, self.bucket_name
-            )
-
-            if not bucket_exists:
-                # Create bucket
-                await loop.run_in_executor(
-                    None, self.client.make_bucket, self.bucket_name
-                )
-                print(f"✅ Created MinIO bucket: {self.bucket_name}")
-            else:
-                print(f"✅ MinIO bucket exists: {self.bucket_name}")
-
-            self._bucket_checked = True
+            # Check + create in a single thread pool hop
+            await self._run(self._ensure_bucket_exists_sync)
 
-        except S3Error as e:
-            print(f"❌ MinIO bucket error: {e}")
+        except Exception as e:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Storage initialization failed: {str(e)}",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
     def _ensure_bucket_exists_sync(self):
@@ -73,14 +172,14 @@ class MinIOService:
             if not bucket_exists:
                 # Create bucket
                 self.client.make_bucket(self.bucket_name)
-                print(f"✅ Created MinIO bucket: {self.bucket_name}")
+                logger.info("✅ Created MinIO bucket: %s", self.bucket_name)
             else:
-                print(f"✅ MinIO bucket exists: {self.bucket_name}")
+                logger.info("✅ MinIO bucket exists: %s", self.bucket_name)
 
             self._bucket_checked = True
 
         except S3Error as e:
-            print(f"❌ MinIO bucket error: {e}")
+            logger.error("❌ MinIO bucket error: %s", e)
             raise Exception(f"Storage initialization failed: {str(e)}")
 
     async def upload_file(
@@ -89,44 +188,112 @@ class MinIOService:
         data: Union[bytes, BinaryIO],
         content_type: str = "application/octet-stream",
         metadata: Optional[dict] = None,
+        size: Optional[int] = None,
     ) -> str:
-        """Upload file to MinIO storage"""
+        """Upload file to MinIO storage (pass size when the caller knows it)"""
         await self._ensure_bucket_exists()
 
         try:
-            # Convert bytes to BytesIO if needed
-            if isinstance(data, bytes):
-                data_stream = io.BytesIO(data)
-                length = len(data)
-            else:
-                data_stream = data
-                # For file-like objects, seek to end to get size
-                data_stream.seek(0, 2)
-                length = data_stream.tell()
-                data_stream.seek(0)
+            data_stream, length = _as_stream(data, size)
 
             # Prepare metadata
             if metadata is None:
                 metadata = {}
 
-            # Upload file
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                self.client.put_object,
-                self.bucket_name,
-                object_name,
-                data_stream,
-                length,
-                content_type,
-                metadata,
+            # Upload file (all parts in one thread pool hop)
+            result = await self._run(
+                partial(
+                    self.client.put_object,
+                    self.bucket_name,
+                    object_name,
+                    data_stream,
+                    length,
+                    content_type,
+                    metadata,
+                    part_size=MULTIPART_PART_SIZE,
+                    num_parallel_uploads=MULTIPART_PARALLEL_UPLOADS,
+                ),
             )
 
-            print(f"✅ Uploaded file: {object_name}")
+            _stat_cache.pop(object_name, None)
+            logger.info("✅ Uploaded file: %s", object_name)
             return object_name
 
         except S3Error as e:
-            print(f"❌ Upload failed for {object_name}: {e}")
+            logger.error("❌ Upload failed for %s: %s", object_name, e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"File upload failed: {str(e)}",
+            )
+
+    async def upload_stream(
+        self,
+        object_name: str,
+        stream: BinaryIO,
+        content_type: str = "application/octet-stream",
+        part_size: int = MULTIPART_PART_SIZE,
+        size: Optional[int] = None,
+    ) -> str:
+        """Stream a file-like object to MinIO as a multipart upload
+
+        The stream is read part by part, so the file is never held in memory.
+        A known size lets the parts go up in parallel.
+        """
+        await self._ensure_bucket_exists()
+
+        try:
+            await self._run(
+                partial(
+                    self.client.put_object,
+                    self.bucket_name,
+                    object_name,
+                    stream,
+                    length=-1 if size is None else size,
+                    content_type=content_type,
+                    part_size=part_size,
+                    num_parallel_uploads=MULTIPART_PARALLEL_UPLOADS,
+                ),
+            )
+
+            _stat_cache.pop(object_name, None)
+            logger.info("✅ Uploaded file: %s", object_name)
+            return object_name
+
+        except S3Error as e:
+            logger.error("❌ Upload failed for %s: %s", object_name, e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"File upload failed: {str(e)}",
+            )
+
+    async def upload_path(
+        self,
+        object_name: str,
+        file_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """Upload a local file by path, streamed from disk"""
+        await self._ensure_bucket_exists()
+
+        try:
+            await self._run(
+                partial(
+                    self.client.fput_object,
+                    self.bucket_name,
+                    object_name,
+                    file_path,
+                    content_type=content_type,
+                    part_size=MULTIPART_PART_SIZE,
+                    num_parallel_uploads=MULTIPART_PARALLEL_UPLOADS,
+                ),
+            )
+
+            _stat_cache.pop(object_name, None)
+            logger.info("✅ Uploaded file: %s", object_name)
+            return object_name
+
+        except S3Error as e:
+            logger.error("❌ Upload failed for %s: %s", object_name, e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"File upload failed: {str(e)}",
@@ -138,21 +305,13 @@ class MinIOService:
         data: Union[bytes, BinaryIO],
         content_type: str = "application/octet-stream",
         metadata: Optional[dict] = None,
+        size: Optional[int] = None,
     ) -> str:
         """Synchronous upload for use in Celery tasks"""
         self._ensure_bucket_exists_sync()
 
         try:
-            # Convert bytes to BytesIO if needed
-            if isinstance(data, bytes):
-                data_stream = io.BytesIO(data)
-                length = len(data)
-            else:
-                data_stream = data
-                # For file-like objects, seek to end to get size
-                data_stream.seek(0, 2)
-                length = data_stream.tell()
-                data_stream.seek(0)
+            data_stream, length = _as_stream(data, size)
 
             # Prepare metadata
             if metadata is None:
@@ -166,34 +325,57 @@ class MinIOService:
                 length,
                 content_type,
                 metadata,
+                part_size=MULTIPART_PART_SIZE,
+                num_parallel_uploads=MULTIPART_PARALLEL_UPLOADS,
             )
 
-            print(f"✅ Uploaded file: {object_name}")
+            _stat_cache.pop(object_name, None)
+            logger.info("✅ Uploaded file: %s", object_name)
             return object_name
 
         except S3Error as e:
-            print(f"❌ Upload failed for {object_name}: {e}")
+            logger.error("❌ Upload failed for %s: %s", object_name, e)
             raise Exception(f"File upload failed: {str(e)}")
 
-    async def get_file_content(self, object_name: str) -> bytes:
-        """Get file content from MinIO storage"""
+    def _read_object(self, object_name: str, offset: int = 0, length: int = 0) -> bytes:
+        """GET an object (or byte range) and read the body, blocking"""
+        response = self.client.get_object(
+            self.bucket_name, object_name, offset=offset, length=length
+        )
         try:
-            loop = asyncio.get_event_loop()
-
-            # Get object
-            response = await loop.run_in_executor(
-                None, self.client.get_object, self.bucket_name, object_name
-            )
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
 
-            # Read content
-            content = response.read()
+    def _read_object_tagged(self, object_name: str) -> Tuple[str, bytes]:
+        """GET a whole object, returning its ETag with the body, blocking"""
+        response = self.client.get_object(self.bucket_name, object_name)
+        try:
+            return response.headers.get("ETag", "").strip('"'), response.read()
+        finally:
             response.close()
             response.release_conn()
 
+    async def get_file_content(self, object_name: str) -> bytes:
+        """Get file content from MinIO storage"""
+        try:
+            cached = _content_cache.get(object_name)
+            if cached is not None:
+                # Conditional read: a HEAD revalidates instead of re-downloading
+                info = await self.stat_file(object_name)
+                if info is not None and info["etag"] == cached[0]:
+                    return cached[1]
+                _content_cache.pop(object_name, None)
+
+            # Request and body read share one thread pool hop (and stay off the loop)
+            etag, content = await self._run(self._read_object_tagged, object_name)
+            if etag and len(content) <= CONTENT_CACHE_MAX_OBJECT:
+                _content_cache[object_name] = (etag, content)
             return content
 
         except S3Error as e:
-            print(f"❌ Failed to get file {object_name}: {e}")
+            logger.error("❌ Failed to get file %s: %s", object_name, e)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"File not found: {object_name}",
@@ -202,75 +384,144 @@ class MinIOService:
     def get_file_content_sync(self, object_name: str) -> bytes:
         """Synchronous get file content for use in Celery tasks"""
         try:
-            # Get object synchronously
-            response = self.client.get_object(self.bucket_name, object_name)
-
-            # Read content
-            content = response.read()
-            response.close()
-            response.release_conn()
-
-            return content
+            return self._read_object(object_name)
 
         except S3Error as e:
-            print(f"❌ Failed to get file {object_name}: {e}")
+            logger.error("❌ Failed to get file %s: %s", object_name, e)
             raise Exception(f"File not found: {object_name}")
 
     async def get_file_stream(self, object_name: str):
         """Get file stream from MinIO storage"""
         try:
-            loop = asyncio.get_event_loop()
+            response = await self._run(
+                self.client.get_object, self.bucket_name, object_name
+            )
 
-            response = await loop.run_in_executor(
-                None, self.client.get_object, self.bucket_name, object_name
+            return response
+
+        except S3Error as e:
+            logger.error("❌ Failed to stream file %s: %s", object_name, e)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"File not found: {object_name}",
+            )
+
+    async def get_file_range(self, object_name: str, offset: int = 0, length: int = 0):
+        """Get a byte range of a file from MinIO storage (ranged GET)"""
+        try:
+            response = await self._run(
+                partial(
+                    self.client.get_object,
+                    self.bucket_name,
+                    object_name,
+                    offset=offset,
+                    length=length,
+                ),
             )
 
             return response
 
         except S3Error as e:
-            print(f"❌ Failed to stream file {object_name}: {e}")
+            logger.error("❌ Failed to stream file %s: %s", object_name, e)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"File not found: {object_name}",
             )
 
-    async def delete_file(self, object_name: str) -> bool:
-        """Delete file from MinIO storage"""
+    async def iter_file_range(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: int = settings.STREAMING_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Open a (ranged) GET and return an iterator over its body in chunks
+
+        Sync iterator: StreamingResponse drains it in a threadpool, so the
+        blocking socket reads never run on the event loop. The connection goes
+        back to the pool once the body is consumed or the client disconnects.
+        """
+        response = await self.get_file_range(object_name, offset=offset, length=length)
+
+        def iterate() -> Iterator[bytes]:
+            try:
+                yield from response.stream(chunk_size)
+            finally:
+                response.close()
+                response.release_conn()
+
+        return iterate()
+
+    async def read_file_range(
+        self, object_name: str, offset: int, length: int
+    ) -> bytes:
+        """Read a byte range of a file in one piece (ranged GET)"""
         try:
-            loop = asyncio.get_event_loop()
+            return await self._run(self._read_object, object_name, offset, length)
 
-            await loop.run_in_executor(
-                None, self.client.remove_object, self.bucket_name, object_name
+        except S3Error as e:
+            logger.error("❌ Failed to read file %s: %s", object_name, e)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"File not found: {object_name}",
             )
 
-            print(f"✅ Deleted file: {object_name}")
+    async def delete_file(self, object_name: str) -> bool:
+        """Delete file from MinIO storage"""
+        try:
+            await self._run(self.client.remove_object, self.bucket_name, object_name)
+
+            _content_cache.pop(object_name, None)
+            _stat_cache.pop(object_name, None)
+            logger.info("✅ Deleted file: %s", object_name)
             return True
 
         except S3Error as e:
-            print(f"❌ Failed to delete file {object_name}: {e}")
+            logger.error("❌ Failed to delete file %s: %s", object_name, e)
             return False
 
     def delete_file_sync(self, object_name: str) -> bool:
         """Synchronous delete for use in Celery tasks"""
         try:
             self.client.remove_object(self.bucket_name, object_name)
-            print(f"✅ Deleted file: {object_name}")
+            logger.info("✅ Deleted file: %s", object_name)
             return True
 
         except S3Error as e:
-            print(f"❌ Failed to delete file {object_name}: {e}")
+            logger.error("❌ Failed to delete file %s: %s", object_name, e)
             return False
 
-    async def file_exists(self, object_name: str) -> bool:
-        """Check if file exists in MinIO storage"""
-        try:
-            loop = asyncio.get_event_loop()
+    async def stat_file(self, object_name: str) -> Optional[dict]:
+        """Get file information with a single HEAD, or None if it doesn't exist"""
+        if object_name in _stat_cache:
+            info = _stat_cache[object_name]
+            return dict(info) if info is not None else None
 
-            await loop.run_in_executor(
-                None, self.client.stat_object, self.bucket_name, object_name
+        try:
+            stat = await self._run(
+                self.client.stat_object, self.bucket_name, object_name
             )
+        except S3Error as e:
+            if e.code in _NOT_FOUND_CODES:
+                _stat_cache[object_name] = None
+                return None
+            raise
+
+        info = {
+            "name": object_name,
+            "size": stat.size,
+            "etag": stat.etag,
+            "last_modified": stat.last_modified.isoformat(),
+            "content_type": stat.content_type,
+            "metadata": stat.metadata,
+        }
+        _stat_cache[object_name] = info
+        return dict(info)
 
-            return True
+    async def file_exists(self, object_name: str) -> bool:
+        """Check if file exists in MinIO storage"""
+        try:
+            return await self.stat_file(object_name) is not None
 
         except S3Error:
             return False
@@ -286,46 +537,33 @@ class MinIOService:
     async def get_file_info(self, object_name: str) -> dict:
         """Get file information from MinIO storage"""
         try:
-            loop = asyncio.get_event_loop()
-
-            stat = await loop.run_in_executor(
-                None, self.client.stat_object, self.bucket_name, object_name
-            )
-
-            return {
-                "name": object_name,
-                "size": stat.size,
-                "etag": stat.etag,
-                "last_modified": stat.last_modified.isoformat(),
-                "content_type": stat.content_type,
-                "metadata": stat.metadata,
-            }
+            info = await self.stat_file(object_name)
+        except S3Error:
+            info = None
 
-        except S3Error as e:
+        if info is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"File not found: {object_name}",
             )
+        return info
 
     async def get_presigned_url(
         self, object_name: str, expires_in: int = 3600, method: str = "GET"
     ) -> str:
         """Get presigned URL for file access"""
         try:
-            loop = asyncio.get_event_loop()
-
-            url = await loop.run_in_executor(
-                None,
-                self.client.presigned_get_object,
-                self.bucket_name,
-                object_name,
-                timedelta(seconds=expires_in),
+            # SigV4 presigning is local HMAC work: cheaper inline than an executor hop
+            url = self.client.presigned_get_object(
+                self.bucket_name, object_name, timedelta(seconds=expires_in)
             )
 
             return url
 
         except S3Error as e:
-            print(f"❌ Failed to generate presigned URL for {object_name}: {e}")
+            logger.error(
+                "❌ Failed to generate presigned URL for %s: %s", object_name, e
+            )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to generate access URL: {str(e)}",
@@ -334,20 +572,15 @@ class MinIOService:
     async def get_upload_url(self, object_name: str, expires_in: int = 3600) -> str:
         """Get presigned URL for file upload"""
         try:
-            loop = asyncio.get_event_loop()
-
-            url = await loop.run_in_executor(
-                None,
-                self.client.presigned_put_object,
-                self.bucket_name,
-                object_name,
-                timedelta(seconds=expires_in),
+            # SigV4 presigning is local HMAC work: cheaper inline than an executor hop
+            url = self.client.presigned_put_object(
+                self.bucket_name, object_name, timedelta(seconds=expires_in)
             )
 
             return url
 
         except S3Error as e:
-            print(f"❌ Failed to generate upload URL for {object_name}: {e}")
+            logger.error("❌ Failed to generate upload URL for %s: %s", object_name, e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to generate upload URL: {str(e)}",
@@ -358,79 +591,95 @@ class MinIOService:
     ) -> list:
         """List files in MinIO storage"""
         try:
-            loop = asyncio.get_event_loop()
-
-            objects = await loop.run_in_executor(
-                None,
+            # islice stops paging once max_keys objects arrived (no full listing)
+            rows = await self._run(
                 lambda: list(
-                    self.client.list_objects(
-                        self.bucket_name, prefix=prefix, recursive=recursive
+                    map(
+                        _LIST_FIELDS,
+                        islice(
+                            self.client.list_objects(
+                                self.bucket_name, prefix=prefix, recursive=recursive
+                            ),
+                            max_keys,
+                        ),
                     )
                 ),
             )
 
-            # Limit results
-            objects = objects[:max_keys]
-
             return [
                 {
-                    "name": obj.object_name,
-                    "size": obj.size,
+                    "name": name,
+                    "size": size,
                     "last_modified": (
-                        obj.last_modified.isoformat() if obj.last_modified else None
+                        last_modified.isoformat() if last_modified else None
                     ),
-                    "etag": obj.etag,
-                    "is_dir": obj.is_dir,
+                    "etag": etag,
+                    "is_dir": is_dir,
                 }
-                for obj in objects
+                for name, size, last_modified, etag, is_dir in rows
             ]
 
         except S3Error as e:
-            print(f"❌ Failed to list files with prefix {prefix}: {e}")
+            logger.error("❌ Failed to list files with prefix %s: %s", prefix, e)
             return []
 
-    async def copy_file(self, source_object: str, destination_object: str) -> bool:
-        """Copy file within MinIO storage"""
+    async def copy_file(
+        self,
+        source_object: str,
+        destination_object: str,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> bool:
+        """Copy file within MinIO storage (server-side, no bytes through the app)
+
+        Passing metadata replaces the destination's metadata instead of copying it,
+        which also rewrites an object's metadata in place when source == destination.
+        """
         try:
-            from minio.commonconfig import CopySource
-
-            loop = asyncio.get_event_loop()
-
-            await loop.run_in_executor(
-                None,
-                self.client.copy_object,
-                self.bucket_name,
-                destination_object,
-                CopySource(self.bucket_name, source_object),
+            await self._run(
+                partial(
+                    self.client.copy_object,
+                    self.bucket_name,
+                    destination_object,
+                    CopySource(self.bucket_name, source_object),
+                    metadata=metadata,
+                    metadata_directive=REPLACE if metadata is not None else None,
+                )
             )
 
-            print(f"✅ Copied file: {source_object} -> {destination_object}")
+            _stat_cache.pop(destination_object, None)
+            logger.info("✅ Copied file: %s -> %s", source_object, destination_object)
             return True
 
         except S3Error as e:
-            print(f"❌ Failed to copy file {source_object}: {e}")
+            logger.error("❌ Failed to copy file %s: %s", source_object, e)
             return False
 
+    def _aggregate_objects(self) -> Tuple[int, Counter, Counter]:
+        """Walk the bucket listing once: (total files, count per ext, size per ext)"""
+        counts: Counter = Counter()
+        sizes: Counter = Counter()
+        total_files = 0
+        # list_objects pages lazily, so the bucket is never held as a list
+        splitext = os.path.splitext
+        for obj in self.client.list_objects(self.bucket_name, recursive=True):
+            # splitext slices the string (no list) and ignores dots in folder names
+            ext = splitext(obj.object_name)[1][1:].lower() or "unknown"
+            counts[ext] += 1
+            sizes[ext] += obj.size or 0
+            total_files += 1
+        return total_files, counts, sizes
+
     async def get_storage_stats(self) -> dict:
         """Get storage statistics"""
         try:
-            files = await self.list_files(recursive=True, max_keys=10000)
-
-            total_size = sum(file["size"] for file in files)
-            total_files = len(files)
+            total_files, counts, sizes = await self._run(self._aggregate_objects)
+            total_size = sum(sizes.values())
 
             # Group by file type
-            file_types = {}
-            for file in files:
-                ext = (
-                    file["name"].split(".")[-1].lower()
-                    if "." in file["name"]
-                    else "unknown"
-                )
-                if ext not in file_types:
-                    file_types[ext] = {"count": 0, "size": 0}
-                file_types[ext]["count"] += 1
-                file_types[ext]["size"] += file["size"]
+            file_types = {
+                ext: {"count": count, "size": sizes[ext]}
+                for ext, count in counts.items()
+            }
 
             return {
                 "bucket_name": self.bucket_name,
@@ -451,9 +700,7 @@ class MinIOService:
         """Check MinIO service health"""
         try:
             # Try to list buckets to test connection
-            loop = asyncio.get_event_loop()
-
-            buckets = await loop.run_in_executor(None, self.client.list_buckets)
+            buckets = await self._run(self.client.list_buckets)
 
             bucket_names = [bucket.name for bucket in buckets]
 
@@ -476,78 +723,186 @@ class MinIOService:
 
 # Chunked upload support for large files
 class ChunkedUploadManager:
-    """Manager for chunked file uploads"""
+    """Manager for chunked file uploads, backed by S3 multipart uploads
 
-    def __init__(self, minio_service: MinIOService):
+    Each chunk is sent to storage as a part as soon as it arrives, so only
+    part ETags are kept, in Redis, where every worker can see them.
+    """
+
+    def __init__(self, minio_service: MinIOService, redis=None):
         self.minio = minio_service
-        self.upload_sessions = {}
+        self.redis = redis or get_redis()
+
+    @staticmethod
+    def _keys(upload_id: str) -> Tuple[str, str]:
+        """Redis keys for a session: (session hash, chunk_number -> "etag size")"""
+        return f"upload:{upload_id}", f"upload:{upload_id}:parts"
+
+    async def _get_session(self, upload_id: str) -> dict:
+        session_key, _ = self._keys(upload_id)
+        session = await self.redis.hgetall(session_key)
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+            )
+        return session
 
     async def start_chunked_upload(
-        self, object_name: str, total_size: int, chunk_size: int = 8192
+        self,
+        object_name: str,
+        total_size: int,
+        chunk_size: int = MULTIPART_PART_SIZE,
+        content_type: str = "application/octet-stream",
     ) -> str:
         """Start a chunked upload session"""
-        upload_id = str(id(object_name))  # Simple ID generation
+        if chunk_size < MIN_MULTIPART_PART_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk size must be at least {MIN_MULTIPART_PART_SIZE} bytes",
+            )
 
-        self.upload_sessions[upload_id] = {
-            "object_name": object_name,
-            "total_size": total_size,
-            "chunk_size": chunk_size,
-            "uploaded_chunks": [],
-            "bytes_uploaded": 0,
-        }
+        await self.minio._ensure_bucket_exists()
+
+        try:
+            multipart_id = await self.minio._run(
+                self.minio.client._create_multipart_upload,
+                self.minio.bucket_name,
+                object_name,
+                {"Content-Type": content_type},
+            )
+        except S3Error as e:
+            logger.error(
+                "❌ Failed to start multipart upload for %s: %s", object_name, e
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"File upload failed: {str(e)}",
+            )
+
+        # The storage-issued multipart UploadId is unique and unguessable
+        upload_id = multipart_id
+
+        session_key, _ = self._keys(upload_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                session_key,
+                mapping={
+                    "object_name": object_name,
+                    "total_size": total_size,
+                    "chunk_size": chunk_size,
+                },
+            )
+            pipe.expire(session_key, UPLOAD_SESSION_TTL)
+            await pipe.execute()
 
         return upload_id
 
     async def upload_chunk(
         self, upload_id: str, chunk_data: bytes, chunk_number: int
     ) -> dict:
-        """Upload a chunk of data"""
-        if upload_id not in self.upload_sessions:
+        """Upload a chunk of data as one multipart part (chunk numbers start at 1)"""
+        session = await self._get_session(upload_id)
+
+        if not 1 <= chunk_number <= MAX_MULTIPART_PARTS:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk number must be between 1 and {MAX_MULTIPART_PARTS}",
             )
 
-        session = self.upload_sessions[upload_id]
-
-        # Store chunk (in a real implementation, you'd use MinIO multipart upload)
-        session["uploaded_chunks"].append(
-            {"number": chunk_number, "data": chunk_data, "size": len(chunk_data)}
-        )
+        try:
+            etag = await self.minio._run(
+                self.minio.client._upload_part,
+                self.minio.bucket_name,
+                session["object_name"],
+                chunk_data,
+                None,
+                upload_id,
+                chunk_number,
+            )
+        except S3Error as e:
+            logger.error(
+                "❌ Failed to upload chunk %s of %s: %s", chunk_number, upload_id, e
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Chunk upload failed: {str(e)}",
+            )
 
-        session["bytes_uploaded"] += len(chunk_data)
+        # A re-sent chunk replaces its part; every chunk pushes the expiry out
+        session_key, parts_key = self._keys(upload_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(parts_key, str(chunk_number), f"{etag} {len(chunk_data)}")
+            pipe.expire(session_key, UPLOAD_SESSION_TTL)
+            pipe.expire(parts_key, UPLOAD_SESSION_TTL)
+            pipe.hvals(parts_key)
+            *_, parts = await pipe.execute()
 
-        progress = (session["bytes_uploaded"] / session["total_size"]) * 100
+        bytes_uploaded = sum(int(part.rsplit(" ", 1)[1]) for part in parts)
+        total_size = int(session["total_size"])
+        progress = (bytes_uploaded / total_size) * 100
 
         return {
             "upload_id": upload_id,
             "chunk_number": chunk_number,
-            "bytes_uploaded": session["bytes_uploaded"],
-            "total_size": session["total_size"],
+            "bytes_uploaded": bytes_uploaded,
+            "total_size": total_size,
             "progress": progress,
             "is_complete": progress >= 100,
         }
 
     async def complete_chunked_upload(self, upload_id: str) -> str:
-        """Complete chunked upload and assemble file"""
-        if upload_id not in self.upload_sessions:
+        """Complete chunked upload; storage assembles the parts server-side"""
+        session = await self._get_session(upload_id)
+        session_key, parts_key = self._keys(upload_id)
+
+        stored_parts = await self.redis.hgetall(parts_key)
+        parts = [
+            Part(int(number), value.rsplit(" ", 1)[0])
+            for number, value in sorted(
+                stored_parts.items(), key=lambda item: int(item[0])
+            )
+        ]
+
+        try:
+            await self.minio._run(
+                self.minio.client._complete_multipart_upload,
+                self.minio.bucket_name,
+                session["object_name"],
+                upload_id,
+                parts,
+            )
+        except S3Error as e:
+            logger.error("❌ Failed to complete upload %s: %s", upload_id, e)
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"File upload failed: {str(e)}",
             )
 
-        session = self.upload_sessions[upload_id]
+        # Cleanup session
+        await self.redis.delete(session_key, parts_key)
 
-        # Combine all chunks
-        chunks = sorted(session["uploaded_chunks"], key=lambda x: x["number"])
-        combined_data = b"".join(chunk["data"] for chunk in chunks)
+        _stat_cache.pop(session["object_name"], None)
+        logger.info("✅ Uploaded file: %s", session["object_name"])
+        return session["object_name"]
 
-        # Upload combined file
-        await self.minio.upload_file(
-            session["object_name"],
-            combined_data,
-            content_type="application/octet-stream",
-        )
+    async def abort_chunked_upload(self, upload_id: str) -> bool:
+        """Abort a chunked upload and drop the parts already stored"""
+        session_key, parts_key = self._keys(upload_id)
+        object_name = await self.redis.hget(session_key, "object_name")
+        if object_name is None:
+            return False
 
-        # Cleanup session
-        del self.upload_sessions[upload_id]
+        await self.redis.delete(session_key, parts_key)
 
-        return session["object_name"]
+        try:
+            await self.minio._run(
+                self.minio.client._abort_multipart_upload,
+                self.minio.bucket_name,
+                object_name,
+                upload_id,
+            )
+            return True
+
+        except S3Error as e:
+            logger.error("❌ Failed to abort upload %s: %s", upload_id, e)
+            return False
@@ -3,31 +3,372 @@
 Handles video operations, processing, and management
 """
 
+import asyncio
+import base64
+import binascii
+import json
+import logging
 import os
+import time
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from fractions import Fraction
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import cv2
+from cachetools import TTLCache
 from fastapi import HTTPException, UploadFile, status
+from redis.exceptions import RedisError
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Integer,
+    String,
+    bindparam,
+    case,
+    distinct,
+    func,
+    insert,
+    literal,
+    or_,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from sqlalchemy.future import select
 from sqlalchemy.sql import text
 
+from app.core.cache import get_redis
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.core.security import SecurityManager
-from app.models.video import Video, VideoStatus, VideoUploadSession, VideoViewSession
-from app.services.minio_service import MinIOService
+from app.models.video import (
+    UUID_STR,
+    Video,
+    VideoStatus,
+    VideoUploadSession,
+    VideoViewSession,
+)
+from app.services.minio_service import CountingReader, MinIOService
+
+logger = logging.getLogger(__name__)
+
+# Pending video views: (video_id, session_id, user_id, ip, user_agent, created_at)
+_view_buffer: Deque[tuple] = deque(maxlen=100_000)
+VIEW_FLUSH_INTERVAL = 0.2  # seconds
+
+
+class ProgressUpdate(NamedTuple):
+    """Latest buffered playback position for one view session"""
+
+    video_id: str
+    session_id: str
+    user_id: Optional[str]
+    current_time: float
+    completion_percentage: float
+    is_completed: bool
+    last_accessed: datetime
+
+    @property
+    def resume_position(self) -> float:
+        return self.current_time
+
+
+# Pending playback progress: (video_id, session_id) -> latest ProgressUpdate
+_progress_buffer: Dict[Tuple[str, str], ProgressUpdate] = {}
+PROGRESS_FLUSH_INTERVAL = 3.0  # seconds
+
+# Video duration cache for progress pings: video_id -> duration (or None)
+_duration_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+# Columns read by VideoResponse (resolution comes from width/height)
+_VIDEO_LIST_COLUMNS = load_only(
+    Video.id,
+    Video.title,
+    Video.description,
+    Video.duration,
+    Video.file_size,
+    Video.file_type,
+    Video.width,
+    Video.height,
+    Video.status,
+    Video.thumbnail_path,
+    Video.view_count,
+    Video.tags,
+    Video.is_public,
+    Video.is_featured,
+    Video.created_at,
+    Video.updated_at,
+    Video.uploaded_at,
+    Video.processed_at,
+)
+
+# Stored object stat cache: video_id -> (size, etag, content_type)
+_object_stat_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+# Presigned stream URLs are reused from Redis until this long before they expire
+PRESIGN_SAFETY_MARGIN = 300  # seconds
+
+# Top videos: sessions in the window are aggregated per video before the join,
+# so only recent rows are scanned (via the (video_id, created_at) index).
+# Result columns are typed so SQLite's text timestamps come back as datetimes
+_TOP_VIDEOS_QUERY = text(
+    """
+    WITH recent AS (
+        SELECT
+            video_id,
+            COUNT(*) AS view_count,
+            COUNT(DISTINCT user_id) AS unique_viewers,
+            SUM(watch_duration) AS total_watch_time,
+            AVG(completion_percentage) AS avg_completion
+        FROM video_view_sessions
+        WHERE created_at >= :start_date
+        GROUP BY video_id
+    )
+    SELECT
+        v.id,
+        v.title,
+        v.duration,
+        v.created_at,
+        COALESCE(r.view_count, 0) AS view_count,
+        COALESCE(r.unique_viewers, 0) AS unique_viewers,
+        r.total_watch_time,
+        r.avg_completion
+    FROM videos v
+    LEFT JOIN recent r ON r.video_id = v.id
+    WHERE v.status = 'completed'
+    ORDER BY view_count DESC
+    LIMIT :limit
+    """
+).columns(
+    id=UUID_STR,
+    title=String,
+    duration=Float,
+    created_at=DateTime,
+    view_count=Integer,
+    unique_viewers=Integer,
+    total_watch_time=Float,
+    avg_completion=Float,
+)
+
+# ffprobe reads only the container header over HTTP (no download to /tmp)
+FFPROBE_TIMEOUT = 30  # seconds
+FFPROBE_URL_EXPIRY = 600  # seconds
+
+# Thumbnails: one frame picked near the middle, scaled to 480px wide
+THUMBNAIL_FILTER = "thumbnail,scale=480:-1"
+FFMPEG_THUMBNAIL_TIMEOUT = 60  # seconds
+
+
+async def _ffprobe(source: str) -> Optional[Dict[str, Any]]:
+    """Probe a video file or URL with ffprobe; None if it is unavailable or fails"""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_streams",
+            "-show_format",
+            "-of",
+            "json",
+            source,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), FFPROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    if proc.returncode != 0:
+        return None
+
+    probe = json.loads(stdout)
+    streams = probe.get("streams", [])
+    video_stream = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video_stream is None:
+        return None
+
+    rate = video_stream.get("avg_frame_rate") or video_stream.get("r_frame_rate")
+    try:
+        fps = float(Fraction(rate))
+    except (TypeError, ValueError, ZeroDivisionError):
+        fps = 0.0
+    duration = float(
+        probe.get("format", {}).get("duration") or video_stream.get("duration") or 0
+    )
+    frame_count = int(video_stream.get("nb_frames") or round(duration * fps))
+
+    return {
+        "duration": duration,
+        "width": int(video_stream.get("width") or 0),
+        "height": int(video_stream.get("height") or 0),
+        "fps": fps,
+        "frame_count": frame_count,
+        "codec": video_stream.get("codec_name", "unknown"),
+    }
+
+
+def _opencv_probe(path: str) -> Dict[str, Any]:
+    """Fallback metadata read with OpenCV (needs a local copy of the file)"""
+    cap = cv2.VideoCapture(path)
+    try:
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        return {
+            "duration": frame_count / fps if fps > 0 else 0,
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": fps,
+            "frame_count": frame_count,
+            "codec": "unknown",
+        }
+    finally:
+        cap.release()
+
+
+async def _ffmpeg_thumbnail(source: str, thumbnail_path: str, seek: float) -> bool:
+    """Write one JPEG near `seek` seconds; False if ffmpeg is missing or fails
+
+    -ss before -i seeks to the nearest keyframe instead of decoding up to it.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg",
+            "-v",
+            "error",
+            "-y",
+            "-ss",
+            f"{seek:.3f}",
+            "-i",
+            source,
+            "-frames:v",
+            "1",
+            "-vf",
+            THUMBNAIL_FILTER,
+            "-q:v",
+            "3",
+            thumbnail_path,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return False
+
+    try:
+        await asyncio.wait_for(proc.wait(), FFMPEG_THUMBNAIL_TIMEOUT)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return False
+    return proc.returncode == 0 and os.path.exists(thumbnail_path)
+
+
+def _write_file(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor: the sort key of the last row on a page"""
+    raw = "|".join(v.isoformat() if isinstance(v, datetime) else str(v) for v in values)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> List[Any]:
+    """Parse a cursor back into its sort key values (one parser each); 400 if bad"""
+    try:
+        values = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        if len(values) != len(parsers):
+            raise ValueError("wrong number of fields")
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def _parse_uuid(value: str) -> str:
+    return str(uuid.UUID(value))
+
+
+def _keyset_after(columns: Tuple[Any, ...], values: List[Any]):
+    """Rows sorting strictly after the cursor row in DESC order
+
+    Values bind with their column's type, so ids compare as UUIDs and
+    timestamps in the stored format (not as VARCHAR).
+    """
+    return tuple_(*columns) < tuple_(
+        *(literal(value, column.type) for column, value in zip(columns, values))
+    )
+
+
+def _view_totals_query(
+    video_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+):
+    """One-row aggregate over a video's view sessions:
+    (views, unique viewers, watch time, completed views, engaged views)
+    """
+    query = select(
+        func.count(VideoViewSession.id),
+        func.count(distinct(VideoViewSession.user_id)),
+        func.coalesce(func.sum(VideoViewSession.watch_duration), 0.0),
+        func.count(case((VideoViewSession.is_completed.is_(True), 1))),
+        func.count(case((VideoViewSession.completion_percentage >= 25, 1))),
+    ).where(VideoViewSession.video_id == video_id)
+
+    if start_date:
+        query = query.where(VideoViewSession.created_at >= start_date)
+    if end_date:
+        query = query.where(VideoViewSession.created_at <= end_date)
+    return query
 
 
 class VideoService:
     """Video service for managing video operations"""
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        minio_service: Optional[MinIOService] = None,
+        redis=None,
+    ):
         self.db = db_session
-        self.minio_service = MinIOService()
+        self.minio_service = minio_service or MinIOService()
+        self.redis = redis or get_redis()
         self.security = SecurityManager()
 
+    @staticmethod
+    def _presign_key(video_id: str) -> str:
+        """One Redis hash per video: expires_in -> "signed_at url" """
+        return f"presign:{video_id}"
+
     async def create_video(
         self,
         title: str,
@@ -46,7 +387,6 @@ class VideoService:
             "title": title,
             "description": description,
             "status": VideoStatus.PENDING,
-            "created_at": datetime.utcnow(),
             **kwargs,
         }
 
@@ -89,11 +429,26 @@ class VideoService:
         limit: int = 100,
         status: Optional[VideoStatus] = None,
         search: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[Video]:
-        """Get list of videos with filtering"""
-        try:
-            query = select(Video)
+        """Get list of videos with filtering
+
+        Pass the previous page's cursor (see encode_cursor) to seek past it
+        instead of scanning `skip` rows; skip is ignored when a cursor is given.
+        """
+        query = select(Video).options(_VIDEO_LIST_COLUMNS)
+
+        # Keyset pagination on (created_at, id): cost no longer grows with depth
+        if cursor:
+            query = query.where(
+                _keyset_after(
+                    (Video.created_at, Video.id),
+                    decode_cursor(cursor, datetime.fromisoformat, _parse_uuid),
+                )
+            )
+            skip = 0
 
+        try:
             # Apply filters
             if status:
                 query = query.where(Video.status == status)
@@ -102,7 +457,10 @@ class VideoService:
                 query = query.where(Video.title.ilike(f"%{search}%"))
 
             # Apply pagination and ordering
-            query = query.order_by(Video.created_at.desc()).offset(skip).limit(limit)
+            query = query.order_by(Video.created_at.desc(), Video.id.desc())
+            if skip:
+                query = query.offset(skip)
+            query = query.limit(limit)
 
             result = await self.db.execute(query)
             return result.scalars().all()
@@ -112,6 +470,28 @@ class VideoService:
                 detail=f"Failed to retrieve videos: {str(e)}",
             )
 
+    async def get_dashboard_counts(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-status counts and totals in a single aggregate query"""
+        query = select(
+            Video.status,
+            func.count(Video.id),
+            func.coalesce(func.sum(Video.view_count), 0),
+            func.coalesce(func.sum(Video.file_size), 0),
+            func.coalesce(func.sum(Video.duration), 0),
+        ).group_by(Video.status)
+
+        result = await self.db.execute(query)
+
+        return {
+            video_status: {
+                "count": count,
+                "views": views,
+                "size": size,
+                "duration": duration,
+            }
+            for video_status, count, views, size, duration in result.all()
+        }
+
     async def upload_video_file(
         self, video: Video, file: UploadFile, chunk_size: int = 8192
     ) -> VideoUploadSession:
@@ -138,14 +518,17 @@ class VideoService:
             # Upload file to MinIO
             file_path = f"videos/{video.id}/{video.filename}"
 
-            # Read file content
-            file_content = await file.read()
-            upload_session.bytes_uploaded = len(file_content)
-
-            # Upload to storage
-            await self.minio_service.upload_file(
-                file_path, file_content, content_type=video.file_type
+            # Stream the spooled upload straight to storage (multipart, no full read)
+            await file.seek(0)
+            reader = CountingReader(file.file)
+            await self.minio_service.upload_stream(
+                file_path, reader, content_type=video.file_type, size=file.size
             )
+            _object_stat_cache.pop(video.id, None)
+
+            # Size is what was actually sent to storage, not what the client claimed
+            upload_session.bytes_uploaded = reader.bytes_read
+            video.file_size = reader.bytes_read
 
             # Update upload session
             upload_session.status = VideoStatus.COMPLETED
@@ -197,6 +580,13 @@ class VideoService:
             # Mark as deleted
             video.status = VideoStatus.DELETED
             await self.db.commit()
+            _object_stat_cache.pop(video_id, None)
+            try:
+                await self.redis.delete(self._presign_key(video_id))
+            except RedisError as e:
+                logger.warning(
+                    "⚠️ Failed to drop cached stream URL for %s: %s", video_id, e
+                )
 
             return True
 
@@ -209,7 +599,29 @@ class VideoService:
     async def get_video_stream_url(
         self, video_id: str, quality: Optional[str] = None, expires_in: int = 3600
     ) -> str:
-        """Get presigned URL for video streaming"""
+        """Get presigned URL for video streaming
+
+        Cached in Redis per requested lifetime, so repeat viewers skip both the
+        DB lookup and the signer. A cached URL is only handed out while at least
+        PRESIGN_SAFETY_MARGIN of its own lifetime remains.
+        """
+        key = self._presign_key(video_id)
+        field = str(expires_in)
+        reuse_for = expires_in - PRESIGN_SAFETY_MARGIN
+
+        if reuse_for > 0:
+            try:
+                cached = await self.redis.hget(key, field)
+            except RedisError as e:
+                logger.warning(
+                    "⚠️ Failed to read cached stream URL for %s: %s", video_id, e
+                )
+                cached = None
+            if cached:
+                signed_at, url = cached.split(" ", 1)
+                if time.time() - float(signed_at) < reuse_for:
+                    return url
+
         video = await self.get_video_by_id(video_id)
         if not video or video.status != VideoStatus.COMPLETED:
             raise HTTPException(
@@ -222,6 +634,16 @@ class VideoService:
             video.file_path, expires_in=expires_in
         )
 
+        # Short-lived URLs are never cached: they would expire in the cache
+        if reuse_for > 0:
+            try:
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(key, field, f"{time.time():.3f} {presigned_url}")
+                    pipe.expire(key, reuse_for)
+                    await pipe.execute()
+            except RedisError as e:
+                logger.warning("⚠️ Failed to cache stream URL for %s: %s", video_id, e)
+
         return presigned_url
 
     async def stream_video_content(self, video_id: str) -> bytes:
@@ -237,49 +659,75 @@ class VideoService:
         content = await self.minio_service.get_file_content(video.file_path)
         return content
 
+    async def get_video_object_stat(self, video: Video) -> Tuple[int, str, str]:
+        """Get (size, etag, content_type) of the stored video file
+
+        Served from a short-lived cache; misses cost a single HEAD request.
+        """
+        cached = _object_stat_cache.get(video.id)
+        if cached is not None:
+            return cached
+
+        file_info = await self.minio_service.get_file_info(video.file_path)
+        stat = (file_info["size"], file_info["etag"], file_info["content_type"])
+        _object_stat_cache[video.id] = stat
+        return stat
+
+    async def stream_range(self, video: Video, start: int, end: int) -> Iterator[bytes]:
+        """Stream bytes [start, end] of a video directly from storage"""
+        return await self.minio_service.iter_file_range(
+            video.file_path, offset=start, length=end - start + 1
+        )
+
+    async def read_range(self, video: Video, start: int, end: int) -> bytes:
+        """Read bytes [start, end] of a video in one piece (for small ranges)"""
+        return await self.minio_service.read_file_range(
+            video.file_path, offset=start, length=end - start + 1
+        )
+
     async def update_video_progress(
         self,
         video_id: str,
         session_id: str,
         current_time: float,
         user_id: Optional[str] = None,
-    ) -> VideoViewSession:
-        """Update video viewing progress"""
-        video = await self.get_video_by_id(video_id)
-        if not video:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Video not found"
-            )
-
-        # Find or create view session
-        result = await self.db.execute(
-            select(VideoViewSession).where(
-                VideoViewSession.video_id == video_id,
-                VideoViewSession.session_id == session_id,
-            )
+    ) -> ProgressUpdate:
+        """Buffer viewing progress; persisted in batches by the progress flusher"""
+        if video_id in _duration_cache:
+            duration = _duration_cache[video_id]
+        else:
+            video = await self.get_video_by_id(video_id)
+            if not video:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Video not found"
+                )
+            duration = _duration_cache[video_id] = video.duration
+
+        key = (video_id, session_id)
+        previous = _progress_buffer.get(key)
+        # Latest ping wins (a seek back is a real position); only completion sticks
+        completion_percentage = (current_time / duration) * 100 if duration else 0
+        progress = ProgressUpdate(
+            video_id=video_id,
+            session_id=session_id,
+            user_id=user_id or (previous.user_id if previous else None),
+            current_time=current_time,
+            completion_percentage=completion_percentage,
+            is_completed=(previous is not None and previous.is_completed)
+            or completion_percentage >= 95.0,
+            last_accessed=datetime.utcnow(),
         )
-        view_session = result.scalar_one_or_none()
-
-        if not view_session:
-            view_session = VideoViewSession(
-                id=str(uuid.uuid4()),
-                video_id=video_id,
-                session_id=session_id,
-                user_id=user_id,
-            )
-            self.db.add(view_session)
-
-        # Update progress
-        if video.duration:
-            view_session.update_progress(current_time, video.duration)
-
-        await self.db.commit()
-        return view_session
+        _progress_buffer[key] = progress
+        return progress
 
     async def get_video_progress(
         self, video_id: str, session_id: str
-    ) -> Optional[VideoViewSession]:
+    ) -> Optional[Union[ProgressUpdate, VideoViewSession]]:
         """Get video viewing progress"""
+        buffered = _progress_buffer.get((video_id, session_id))
+        if buffered:
+            return buffered
+
         result = await self.db.execute(
             select(VideoViewSession).where(
                 VideoViewSession.video_id == video_id,
@@ -288,59 +736,54 @@ class VideoService:
         )
         return result.scalar_one_or_none()
 
-    async def generate_video_thumbnail(self, video: Video) -> str:
-        """Generate thumbnail for video"""
+    async def _download_to_temp(self, video: Video) -> str:
+        """Copy the stored video to a local temp file (write runs off the loop)"""
+        temp_video_path = f"/tmp/{video.id}.{video.file_extension[1:]}"
+        video_content = await self.minio_service.get_file_content(video.file_path)
+        await asyncio.to_thread(_write_file, temp_video_path, video_content)
+        return temp_video_path
+
+    async def generate_video_thumbnail(
+        self, video: Video, temp_video_path: Optional[str] = None
+    ) -> Optional[str]:
+        """Generate thumbnail for video
+
+        Reads temp_video_path when the caller already downloaded the file,
+        otherwise ffmpeg seeks within the stored object over a presigned URL.
+        """
+        thumbnail_filename = f"thumbnail_{video.id}.jpg"
+        temp_thumbnail_path = f"/tmp/{thumbnail_filename}"
         try:
-            # Download video file temporarily
-            temp_video_path = f"/tmp/{video.id}.{video.file_extension[1:]}"
-            video_content = await self.minio_service.get_file_content(video.file_path)
-
-            with open(temp_video_path, "wb") as f:
-                f.write(video_content)
-
-            # Generate thumbnail using OpenCV
-            cap = cv2.VideoCapture(temp_video_path)
-
-            # Seek to middle of video
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            middle_frame = frame_count // 2
-            cap.set(cv2.CAP_PROP_POS_FRAMES, middle_frame)
-
-            ret, frame = cap.read()
-            if ret:
-                # Save thumbnail
-                thumbnail_filename = f"thumbnail_{video.id}.jpg"
-                thumbnail_path = f"thumbnails/{video.id}/{thumbnail_filename}"
-                temp_thumbnail_path = f"/tmp/{thumbnail_filename}"
-
-                cv2.imwrite(temp_thumbnail_path, frame)
-
-                # Upload thumbnail to storage
-                with open(temp_thumbnail_path, "rb") as f:
-                    thumbnail_content = f.read()
-
-                await self.minio_service.upload_file(
-                    thumbnail_path, thumbnail_content, content_type="image/jpeg"
-                )
+            source = temp_video_path or await self.minio_service.get_presigned_url(
+                video.file_path, expires_in=FFPROBE_URL_EXPIRY
+            )
 
-                # Update video record
-                video.thumbnail_path = thumbnail_path
-                video.thumbnail_generated = True
-                await self.db.commit()
+            # Keyframe seek to the middle: no decoding of the frames before it
+            seek = (video.duration or 0) / 2
+            if not await _ffmpeg_thumbnail(source, temp_thumbnail_path, seek):
+                return None
 
-                # Cleanup
-                os.remove(temp_video_path)
-                os.remove(temp_thumbnail_path)
+            # Upload thumbnail to storage
+            thumbnail_path = f"thumbnails/{video.id}/{thumbnail_filename}"
+            await self.minio_service.upload_path(
+                thumbnail_path, temp_thumbnail_path, content_type="image/jpeg"
+            )
 
-                return thumbnail_path
+            # Update video record
+            video.thumbnail_path = thumbnail_path
+            video.thumbnail_generated = True
+            await self.db.commit()
 
-            cap.release()
-            os.remove(temp_video_path)
+            return thumbnail_path
 
         except Exception as e:
             print(f"Error generating thumbnail: {e}")
             return None
 
+        finally:
+            # Cleanup
+            _remove_quietly(temp_thumbnail_path)
+
     async def get_video_statistics(self, video_id: str) -> Dict[str, Any]:
         """Get video statistics"""
         video = await self.get_video_by_id(video_id)
@@ -349,19 +792,11 @@ class VideoService:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Video not found"
             )
 
-        # Get view sessions count
-        view_sessions_result = await self.db.execute(
-            select(VideoViewSession).where(VideoViewSession.video_id == video_id)
-        )
-        view_sessions = view_sessions_result.scalars().all()
+        # Aggregate view sessions in the database (one row, no ORM objects)
+        totals = await self.db.execute(_view_totals_query(video_id))
+        total_views, unique_viewers, total_watch_time, completed_views, _ = totals.one()
 
         # Calculate statistics
-        total_views = len(view_sessions)
-        unique_viewers = len(
-            set(session.user_id for session in view_sessions if session.user_id)
-        )
-        total_watch_time = sum(session.watch_duration for session in view_sessions)
-        completed_views = len([s for s in view_sessions if s.is_completed])
         completion_rate = (
             (completed_views / total_views * 100) if total_views > 0 else 0
         )
@@ -393,7 +828,7 @@ class VideoService:
 
         # Check file extension
         file_ext = os.path.splitext(file.filename)[1].lower()
-        if file_ext not in settings.ALLOWED_VIDEO_EXTENSIONS:
+        if file_ext not in settings.allowed_video_extensions:
             raise HTTPException(
                 status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
                 detail=f"File type {file_ext} not supported. Allowed types: {', '.join(settings.ALLOWED_VIDEO_EXTENSIONS)}",
@@ -416,40 +851,36 @@ class VideoService:
     async def _process_video_metadata(self, video: Video):
         """Process video metadata (runs in background)"""
         try:
-            # Download video file temporarily for processing
-            temp_video_path = f"/tmp/{video.id}.{video.file_extension[1:]}"
-            video_content = await self.minio_service.get_file_content(video.file_path)
-
-            with open(temp_video_path, "wb") as f:
-                f.write(video_content)
-
-            # Extract video metadata using OpenCV
-            cap = cv2.VideoCapture(temp_video_path)
-
-            # Get video properties
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            duration = frame_count / fps if fps > 0 else 0
-
-            # Update video with metadata
-            video.duration = duration
-            video.width = width
-            video.height = height
-            video.fps = fps
-            video.metadata = {
-                "frame_count": frame_count,
-                "codec": "unknown",  # Would need ffmpeg for detailed codec info
-                "container": video.file_extension[1:].upper(),
-            }
-
-            cap.release()
-            os.remove(temp_video_path)
+            # Probe straight from storage: ffprobe fetches only the header/moov atom
+            url = await self.minio_service.get_presigned_url(
+                video.file_path, expires_in=FFPROBE_URL_EXPIRY
+            )
+            probe = await _ffprobe(url)
+
+            temp_video_path = None
+            try:
+                if probe is None:
+                    # No ffprobe (or it failed): download and read with OpenCV
+                    temp_video_path = await self._download_to_temp(video)
+                    probe = await asyncio.to_thread(_opencv_probe, temp_video_path)
+
+                # Update video with metadata
+                video.duration = probe["duration"]
+                video.width = probe["width"]
+                video.height = probe["height"]
+                video.fps = probe["fps"]
+                video.metadata = {
+                    "frame_count": probe["frame_count"],
+                    "codec": probe["codec"],
+                    "container": video.file_extension[1:].upper(),
+                }
 
-            # Generate thumbnail
-            if settings.ENABLE_VIDEO_THUMBNAILS:
-                await self.generate_video_thumbnail(video)
+                # Generate thumbnail (from the same download, if there was one)
+                if settings.ENABLE_VIDEO_THUMBNAILS:
+                    await self.generate_video_thumbnail(video, temp_video_path)
+            finally:
+                if temp_video_path:
+                    _remove_quietly(temp_video_path)
 
             # Mark processing as completed
             video.status = VideoStatus.COMPLETED
@@ -466,6 +897,124 @@ class VideoService:
             print(f"Video processing failed for {video.id}: {e}")
 
 
+async def run_view_buffer_flusher(interval: float = VIEW_FLUSH_INTERVAL):
+    """Periodically persist buffered video views (started from app lifespan)"""
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            if _view_buffer:
+                async with AsyncSessionLocal() as db:
+                    await VideoAnalyticsService(db).flush_buffered_views()
+        except asyncio.CancelledError:
+            # Final flush on shutdown
+            if _view_buffer:
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await VideoAnalyticsService(db).flush_buffered_views()
+                except Exception:
+                    logger.exception(
+                        "❌ Final view flush failed, %d views lost", len(_view_buffer)
+                    )
+            raise
+        except Exception:
+            logger.exception("❌ Failed to flush video views")
+
+
+async def flush_buffered_progress() -> int:
+    """Write all buffered progress in one batch, returns number of sessions"""
+    if not _progress_buffer:
+        return 0
+
+    # Swap out the buffer; pings arriving during the flush start a new window
+    pending = dict(_progress_buffer)
+    _progress_buffer.clear()
+
+    try:
+        await _write_progress(pending)
+    except BaseException:
+        # Put the window back for the next flush; newer pings for a key win
+        for key, progress in pending.items():
+            _progress_buffer.setdefault(key, progress)
+        raise
+
+    return len(pending)
+
+
+async def _write_progress(pending: Dict[Tuple[str, str], ProgressUpdate]):
+    """Upsert a window of buffered progress in one transaction"""
+    table = VideoViewSession.__table__
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(table.c.id, table.c.video_id, table.c.session_id).where(
+                table.c.video_id.in_({video_id for video_id, _ in pending}),
+                table.c.session_id.in_({session_id for _, session_id in pending}),
+            )
+        )
+        existing = {(row.video_id, row.session_id): row.id for row in result}
+
+        updates = []
+        inserts = []
+        for key, progress in pending.items():
+            values = {
+                "current_time": progress.current_time,
+                "completion_percentage": progress.completion_percentage,
+                "last_accessed": progress.last_accessed,
+            }
+            if key in existing:
+                updates.append(
+                    {"pk": existing[key], "completed": progress.is_completed, **values}
+                )
+            else:
+                inserts.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "video_id": progress.video_id,
+                        "session_id": progress.session_id,
+                        "user_id": progress.user_id,
+                        "is_completed": progress.is_completed,
+                        **values,
+                    }
+                )
+
+        # One executemany UPDATE + one multi-row INSERT per flush
+        if updates:
+            await db.execute(
+                update(table)
+                .where(table.c.id == bindparam("pk"))
+                .values(
+                    current_time=bindparam("current_time"),
+                    completion_percentage=bindparam("completion_percentage"),
+                    last_accessed=bindparam("last_accessed"),
+                    # Once completed, a session stays completed
+                    is_completed=or_(table.c.is_completed, bindparam("completed")),
+                ),
+                updates,
+            )
+        if inserts:
+            await db.execute(insert(table), inserts)
+        await db.commit()
+
+
+async def run_progress_buffer_flusher(interval: float = PROGRESS_FLUSH_INTERVAL):
+    """Periodically persist buffered playback progress (started from app lifespan)"""
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            await flush_buffered_progress()
+        except asyncio.CancelledError:
+            # Final flush on shutdown
+            try:
+                await flush_buffered_progress()
+            except Exception:
+                logger.exception(
+                    "❌ Final progress flush failed, %d sessions lost",
+                    len(_progress_buffer),
+                )
+            raise
+        except Exception:
+            logger.exception("❌ Failed to flush video progress")
+
+
 class VideoAnalyticsService:
     """Service for video analytics and reporting"""
 
@@ -511,6 +1060,90 @@ class VideoAnalyticsService:
 
         return view_session
 
+    @staticmethod
+    def enqueue_video_view(
+        video_id: str,
+        session_id: str,
+        user_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ):
+        """Buffer a video view; persisted in batches by the view flusher"""
+        _view_buffer.append(
+            (video_id, session_id, user_id, ip_address, user_agent, datetime.utcnow())
+        )
+
+    async def flush_buffered_views(self) -> int:
+        """Write all buffered views in one batch, returns number of new views"""
+        # Drain and dedupe by (video_id, session_id), keeping the first view
+        pending = {}
+        while _view_buffer:
+            view = _view_buffer.popleft()
+            pending.setdefault((view[0], view[1]), view)
+
+        if not pending:
+            return 0
+
+        try:
+            return await self._write_views(pending)
+        except BaseException:
+            # Failed or cancelled: requeue at the front so the next flush retries
+            _view_buffer.extendleft(reversed(list(pending.values())))
+            await self.db.rollback()
+            raise
+
+    async def _write_views(self, pending: Dict[Tuple[str, str], tuple]) -> int:
+        """Insert view rows and bump view counts in one transaction"""
+        pending = dict(pending)
+
+        # Skip sessions that already have a view row
+        video_ids = {video_id for video_id, _ in pending}
+        result = await self.db.execute(
+            select(VideoViewSession.video_id, VideoViewSession.session_id).where(
+                VideoViewSession.video_id.in_(video_ids),
+                VideoViewSession.session_id.in_({sid for _, sid in pending}),
+            )
+        )
+        for key in result.all():
+            pending.pop(tuple(key), None)
+
+        if not pending:
+            return 0
+
+        rows = []
+        view_counts: Dict[str, int] = {}
+        for view in pending.values():
+            video_id, session_id, user_id, ip_address, user_agent, ts = view
+            rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "video_id": video_id,
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "ip_address": ip_address,
+                    "user_agent": user_agent,
+                    "created_at": ts,
+                    "last_accessed": ts,
+                }
+            )
+            view_counts[video_id] = view_counts.get(video_id, 0) + 1
+
+        # One multi-row INSERT + one executemany UPDATE per flush
+        await self.db.execute(insert(VideoViewSession), rows)
+        videos_table = Video.__table__
+        await self.db.execute(
+            update(videos_table)
+            .where(videos_table.c.id == bindparam("video_pk"))
+            .values(view_count=videos_table.c.view_count + bindparam("increment")),
+            [
+                {"video_pk": video_id, "increment": count}
+                for video_id, count in view_counts.items()
+            ],
+        )
+        await self.db.commit()
+
+        return len(rows)
+
     async def get_video_analytics(
         self,
         video_id: str,
@@ -519,23 +1152,17 @@ class VideoAnalyticsService:
     ) -> Dict[str, Any]:
         """Get comprehensive video analytics"""
 
-        # Base query for view sessions
-        query = select(VideoViewSession).where(VideoViewSession.video_id == video_id)
-
-        # Apply date filters
-        if start_date:
-            query = query.where(VideoViewSession.created_at >= start_date)
-        if end_date:
-            query = query.where(VideoViewSession.created_at <= end_date)
-
-        result = await self.db.execute(query)
-        view_sessions = result.scalars().all()
-
-        # Calculate metrics
-        total_views = len(view_sessions)
-        unique_viewers = len(set(s.user_id for s in view_sessions if s.user_id))
-        total_watch_time = sum(s.watch_duration for s in view_sessions)
-        completed_views = len([s for s in view_sessions if s.is_completed])
+        # Aggregate view sessions (with date filters) in a single query
+        result = await self.db.execute(
+            _view_totals_query(video_id, start_date, end_date)
+        )
+        (
+            total_views,
+            unique_viewers,
+            total_watch_time,
+            completed_views,
+            engaged_views,
+        ) = result.one()
 
         # Calculate averages
         avg_watch_time = total_watch_time / total_views if total_views > 0 else 0
@@ -544,7 +1171,6 @@ class VideoAnalyticsService:
         )
 
         # Calculate engagement metrics
-        engaged_views = len([s for s in view_sessions if s.completion_percentage >= 25])
         engagement_rate = (engaged_views / total_views * 100) if total_views > 0 else 0
 
         # Get video info
@@ -579,34 +1205,10 @@ class VideoAnalyticsService:
     ) -> List[Dict[str, Any]]:
         """Get top performing videos"""
         try:
-            # Calculate date range
-            end_date = datetime.now(datetime.timezone.utc)
-            start_date = end_date - timedelta(days=days)
-
-            # Get videos with view counts
-            query = text(
-                """
-            SELECT 
-                v.id,
-                v.title,
-                v.duration,
-                v.created_at,
-                COUNT(vs.id) as view_count,
-                COUNT(DISTINCT vs.user_id) as unique_viewers,
-                SUM(vs.watch_duration) as total_watch_time,
-                AVG(vs.completion_percentage) as avg_completion
-            FROM videos v
-            LEFT JOIN video_view_sessions vs ON v.id = vs.video_id
-            WHERE v.status = 'completed'
-            AND (vs.created_at >= :start_date OR vs.created_at IS NULL)
-            GROUP BY v.id, v.title, v.duration, v.created_at
-            ORDER BY view_count DESC
-            LIMIT :limit
-            """
-            )
+            start_date = datetime.utcnow() - timedelta(days=days)
 
             result = await self.db.execute(
-                query, {"start_date": start_date, "limit": limit}
+                _TOP_VIDEOS_QUERY, {"start_date": start_date, "limit": limit}
             )
 
             return [
@@ -641,8 +1243,12 @@ class VideoSearchService:
         limit: int = 20,
         offset: int = 0,
         filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
     ) -> List[Video]:
-        """Search videos by title, description, and tags"""
+        """Search videos by title, description, and tags
+
+        A cursor (view_count, created_at, id of the last result) replaces offset.
+        """
 
         # Base query
         search_query = select(Video).where(Video.status == VideoStatus.COMPLETED)
@@ -673,13 +1279,25 @@ class VideoSearchService:
                     Video.created_at <= filters["created_before"]
                 )
 
+        # Keyset pagination: seek past the last result instead of OFFSET
+        if cursor:
+            search_query = search_query.where(
+                _keyset_after(
+                    (Video.view_count, Video.created_at, Video.id),
+                    decode_cursor(cursor, int, datetime.fromisoformat, _parse_uuid),
+                )
+            )
+            offset = 0
+
         # Order by relevance (view count for now)
         search_query = search_query.order_by(
-            Video.view_count.desc(), Video.created_at.desc()
+            Video.view_count.desc(), Video.created_at.desc(), Video.id.desc()
         )
 
         # Apply pagination
-        search_query = search_query.offset(offset).limit(limit)
+        if offset:
+            search_query = search_query.offset(offset)
+        search_query = search_query.limit(limit)
 
         result = await self.db.execute(search_query)
         return result.scalars().all()
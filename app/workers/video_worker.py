@@ -259,8 +259,7 @@ class VideoProcessingWorker:
             }
 
         # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _extract_sync)
+        return await asyncio.to_thread(_extract_sync)
 
     async def _generate_thumbnail(
         self, video_path: str, video_id: str
@@ -306,19 +305,15 @@ class VideoProcessingWorker:
             return None
 
         # Run in thread pool
-        loop = asyncio.get_event_loop()
-        temp_path = await loop.run_in_executor(None, _generate_sync)
+        temp_path = await asyncio.to_thread(_generate_sync)
 
         if temp_path and os.path.exists(temp_path):
             try:
                 # Upload to storage
                 thumbnail_path = f"thumbnails/{video_id}/thumbnail_{video_id}.jpg"
 
-                with open(temp_path, "rb") as f:
-                    thumbnail_content = f.read()
-
-                await self.minio_service.upload_file(
-                    thumbnail_path, thumbnail_content, content_type="image/jpeg"
+                await self.minio_service.upload_path(
+                    thumbnail_path, temp_path, content_type="image/jpeg"
                 )
 
                 # Cleanup temp file
@@ -376,8 +371,7 @@ class VideoProcessingWorker:
             }
 
         # Run in thread pool
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _validate_sync)
+        return await asyncio.to_thread(_validate_sync)
 
 
 # Worker operations functions that can be called from Celery tasks
@@ -11,10 +11,12 @@ from typing import Any, Dict, Optional
 
 import cv2
 from celery import Celery
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from celery.signals import worker_process_init
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import selectinload, sessionmaker
 
 from app.core.config import settings
+from app.core.database import async_engine
 from app.models.video import Video, VideoStatus
 from app.services.minio_service import MinIOService
 
@@ -43,10 +45,21 @@ celery_app.conf.update(
 )
 
 # Database setup for tasks
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@worker_process_init.connect
+def reset_db_pools(**kwargs):
+    """Drop connections inherited from the parent process after fork"""
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+
 def get_db():
     """Get database session for tasks"""
     db = SessionLocal()
@@ -406,12 +419,9 @@ def generate_video_thumbnail_sync(
             # Upload to storage
             thumbnail_path = f"thumbnails/{video_id}/{thumbnail_filename}"
 
-            with open(temp_thumbnail_path, "rb") as f:
-                thumbnail_content = f.read()
-
             asyncio.run(
-                minio_service.upload_file(
-                    thumbnail_path, thumbnail_content, content_type="image/jpeg"
+                minio_service.upload_path(
+                    thumbnail_path, temp_thumbnail_path, content_type="image/jpeg"
                 )
             )
 
@@ -443,6 +453,11 @@ def periodic_cleanup() -> Dict[str, Any]:
 
         failed_videos = (
             db.query(Video)
+            # Cascade delete needs the children; load them in two batched SELECTs
+            .options(
+                selectinload(Video.upload_sessions),
+                selectinload(Video.view_sessions),
+            )
             .filter(Video.status == VideoStatus.FAILED, Video.created_at < cutoff_time)
             .all()
         )
@@ -468,6 +483,36 @@ def periodic_cleanup() -> Dict[str, Any]:
         db.close()
 
 
+@celery_app.task(name="ensure_analytics_partitions")
+def ensure_analytics_partitions(months_ahead: int = 2) -> Dict[str, Any]:
+    """Create monthly video_analytics partitions before rows arrive for them"""
+    if engine.dialect.name != "postgresql":
+        return {"status": "skipped", "reason": "partitioning requires PostgreSQL"}
+
+    now = datetime.utcnow()
+    created, errors = [], []
+    for offset in range(months_ahead + 1):
+        year, month = divmod(now.month - 1 + offset, 12)
+        start = datetime(now.year + year, month + 1, 1)
+        year, month = divmod(start.month, 12)
+        end = datetime(start.year + year, month + 1, 1)
+        name = f"video_analytics_{start:%Y_%m}"
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF video_analytics "
+                        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+                    )
+                )
+            created.append(name)
+        except Exception as e:
+            # e.g. the default partition already holds rows for this month
+            errors.append(f"{name}: {str(e)}")
+
+    return {"status": "completed", "partitions": created, "errors": errors}
+
+
 # Setup periodic tasks
 from celery.schedules import crontab
 
@@ -480,4 +525,8 @@ celery_app.conf.beat_schedule = {
         "task": "health_check_videos",
         "schedule": crontab(minute=0, hour="*/6"),  # Run every 6 hours
     },
+    "analytics-partitions": {
+        "task": "ensure_analytics_partitions",
+        "schedule": crontab(minute=30, hour=3),  # Run daily at 3:30 AM
+    },
 }
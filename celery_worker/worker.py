@@ -34,6 +34,7 @@ celery_app.conf.update(
         "process_video_analytics": {"queue": "analytics"},
         "health_check_videos": {"queue": "health"},
         "periodic_cleanup": {"queue": "maintenance"},
+        "ensure_analytics_partitions": {"queue": "maintenance"},
     },
     # Queue configuration
     task_default_queue="default",
@@ -0,0 +1,13 @@
+-- 📦 Widen byte counters to BIGINT so videos over 2 GB don't overflow (PostgreSQL)
+-- Fresh databases get BIGINT columns from create_all and don't need this.
+-- Usage: psql "$DATABASE_URL" -f scripts/migrate_bigint_sizes.sql
+
+BEGIN;
+
+ALTER TABLE videos
+    ALTER COLUMN file_size TYPE BIGINT,
+    ALTER COLUMN bitrate TYPE BIGINT;
+ALTER TABLE video_upload_sessions
+    ALTER COLUMN bytes_uploaded TYPE BIGINT;
+
+COMMIT;
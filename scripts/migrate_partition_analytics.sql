@@ -0,0 +1,41 @@
+-- 📅 Convert video_analytics to a table range-partitioned by date (PostgreSQL, existing databases)
+-- Fresh databases get the partitioned table (plus its default partition) from create_all.
+-- Monthly partitions are then created ahead of time by the ensure_analytics_partitions task.
+-- Usage: psql "$DATABASE_URL" -f scripts/migrate_partition_analytics.sql
+
+BEGIN;
+
+ALTER TABLE video_analytics RENAME TO video_analytics_old;
+ALTER INDEX IF EXISTS ix_video_analytics_video_date RENAME TO ix_video_analytics_old_video_date;
+
+CREATE TABLE video_analytics (
+    LIKE video_analytics_old INCLUDING DEFAULTS,
+    CONSTRAINT pk_video_analytics PRIMARY KEY (id, date),
+    CONSTRAINT fk_video_analytics_video_id_videos
+        FOREIGN KEY (video_id) REFERENCES videos (id)
+) PARTITION BY RANGE (date);
+
+CREATE INDEX ix_video_analytics_video_date ON video_analytics (video_id, date);
+CREATE TABLE video_analytics_default PARTITION OF video_analytics DEFAULT;
+
+-- One partition per month that already has data, so history doesn't sit in the default
+DO $$
+DECLARE
+    month_start date;
+BEGIN
+    FOR month_start IN
+        SELECT DISTINCT date_trunc('month', date)::date FROM video_analytics_old
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF video_analytics FOR VALUES FROM (%L) TO (%L)',
+            'video_analytics_' || to_char(month_start, 'YYYY_MM'),
+            month_start,
+            month_start + INTERVAL '1 month'
+        );
+    END LOOP;
+END $$;
+
+INSERT INTO video_analytics SELECT * FROM video_analytics_old;
+DROP TABLE video_analytics_old;
+
+COMMIT;
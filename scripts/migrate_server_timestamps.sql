@@ -0,0 +1,24 @@
+-- ⏰ Move timestamp defaults into the database (PostgreSQL, existing databases)
+-- The models no longer send created_at/updated_at on INSERT, so older tables
+-- created without server defaults need them. Fresh databases don't need this.
+-- SQLite dev databases can't alter column defaults - recreate them instead.
+-- Usage: psql "$DATABASE_URL" -f scripts/migrate_server_timestamps.sql
+
+BEGIN;
+
+ALTER TABLE videos
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+ALTER TABLE video_upload_sessions
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+ALTER TABLE video_view_sessions
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN last_accessed SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+ALTER TABLE video_analytics
+    ALTER COLUMN date SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+
+COMMIT;
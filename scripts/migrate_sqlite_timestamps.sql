@@ -0,0 +1,19 @@
+-- ⏰ Pad second-resolution timestamps to microseconds (SQLite dev databases)
+-- Rows written by the old CURRENT_TIMESTAMP default are 'YYYY-MM-DD HH:MM:SS',
+-- which sorts below SQLAlchemy's 'YYYY-MM-DD HH:MM:SS.ffffff' for the same second.
+-- Usage: sqlite3 video_streaming.db < scripts/migrate_sqlite_timestamps.sql
+
+BEGIN;
+
+UPDATE videos SET created_at = created_at || '.000000' WHERE length(created_at) = 19;
+UPDATE videos SET updated_at = updated_at || '.000000' WHERE length(updated_at) = 19;
+UPDATE video_upload_sessions SET created_at = created_at || '.000000' WHERE length(created_at) = 19;
+UPDATE video_upload_sessions SET updated_at = updated_at || '.000000' WHERE length(updated_at) = 19;
+UPDATE video_view_sessions SET created_at = created_at || '.000000' WHERE length(created_at) = 19;
+UPDATE video_view_sessions SET updated_at = updated_at || '.000000' WHERE length(updated_at) = 19;
+UPDATE video_view_sessions SET last_accessed = last_accessed || '.000000' WHERE length(last_accessed) = 19;
+UPDATE video_analytics SET date = date || '.000000' WHERE length(date) = 19;
+UPDATE video_analytics SET created_at = created_at || '.000000' WHERE length(created_at) = 19;
+UPDATE video_analytics SET updated_at = updated_at || '.000000' WHERE length(updated_at) = 19;
+
+COMMIT;
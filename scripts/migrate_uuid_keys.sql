@@ -0,0 +1,33 @@
+-- 🔑 Convert VARCHAR UUID keys to native UUID (PostgreSQL, existing databases)
+-- Fresh databases get UUID columns from create_all and don't need this.
+-- Usage: psql "$DATABASE_URL" -f scripts/migrate_uuid_keys.sql
+
+BEGIN;
+
+ALTER TABLE video_upload_sessions DROP CONSTRAINT IF EXISTS video_upload_sessions_video_id_fkey;
+ALTER TABLE video_view_sessions DROP CONSTRAINT IF EXISTS video_view_sessions_video_id_fkey;
+ALTER TABLE video_analytics DROP CONSTRAINT IF EXISTS video_analytics_video_id_fkey;
+
+ALTER TABLE videos ALTER COLUMN id TYPE uuid USING id::uuid;
+
+ALTER TABLE video_upload_sessions
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN video_id TYPE uuid USING video_id::uuid;
+ALTER TABLE video_view_sessions
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN video_id TYPE uuid USING video_id::uuid;
+ALTER TABLE video_analytics
+    ALTER COLUMN id TYPE uuid USING id::uuid,
+    ALTER COLUMN video_id TYPE uuid USING video_id::uuid;
+
+ALTER TABLE video_upload_sessions
+    ADD CONSTRAINT fk_video_upload_sessions_video_id_videos
+    FOREIGN KEY (video_id) REFERENCES videos (id);
+ALTER TABLE video_view_sessions
+    ADD CONSTRAINT fk_video_view_sessions_video_id_videos
+    FOREIGN KEY (video_id) REFERENCES videos (id);
+ALTER TABLE video_analytics
+    ADD CONSTRAINT fk_video_analytics_video_id_videos
+    FOREIGN KEY (video_id) REFERENCES videos (id);
+
+COMMIT;
@@ -0,0 +1,78 @@
+"""
+🧪 Shared test fixtures
+In-memory stand-ins for Redis and the MinIO client (no services needed)
+"""
+
+import pytest
+
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute()"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.calls
+        ]
+
+
+class FakeRedis:
+    """The few hash/string commands the app uses, on plain dicts"""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def expire(self, key, seconds):
+        return key in self.data
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        fields = self.data.setdefault(key, {})
+        if mapping:
+            fields.update({k: str(v) for k, v in mapping.items()})
+        if field is not None:
+            fields[field] = str(value)
+        return 1
+
+    async def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def hvals(self, key):
+        return list(self.data.get(key, {}).values())
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
@@ -0,0 +1,113 @@
+"""
+🧪 Keyset pagination over rows that share a created_at
+"""
+
+import asyncio
+from datetime import datetime
+
+import orjson
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.video import Video, VideoStatus
+from app.schemas.videos import VideoListResponse
+from app.services.video_service import (
+    VideoSearchService,
+    VideoService,
+    encode_cursor,
+)
+
+SHARED_CREATED_AT = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _video(title: str, **kwargs) -> Video:
+    return Video(
+        title=title,
+        filename=f"{title}.mp4",
+        original_filename=f"{title}.mp4",
+        file_path=f"videos/{title}.mp4",
+        file_size=1,
+        file_type="video/mp4",
+        file_extension=".mp4",
+        status=VideoStatus.COMPLETED,
+        **kwargs,
+    )
+
+
+async def _seed():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessions() as db:
+        # Three rows in one instant, three stamped by the server default
+        db.add_all(
+            [_video(f"same-{i}", created_at=SHARED_CREATED_AT) for i in range(3)]
+        )
+        db.add_all([_video(f"server-{i}") for i in range(3)])
+        await db.commit()
+    return engine, sessions
+
+
+async def _collect(fetch_page, cursor_of, limit: int = 2):
+    seen, cursor = [], None
+    for _ in range(10):
+        page = await fetch_page(limit, cursor)
+        seen.extend(video.id for video in page)
+        if len(page) < limit:
+            break
+        cursor = cursor_of(page[-1])
+    return seen
+
+
+def test_get_videos_cursor_pages_cover_every_row_once(fake_redis):
+    async def scenario():
+        engine, sessions = await _seed()
+        async with sessions() as db:
+            service = VideoService(db, minio_service=object(), redis=fake_redis)
+            seen = await _collect(
+                lambda limit, cursor: service.get_videos(limit=limit, cursor=cursor),
+                lambda video: encode_cursor(video.created_at, video.id),
+            )
+        await engine.dispose()
+        return seen
+
+    seen = asyncio.run(scenario())
+    assert len(seen) == 6
+    assert len(set(seen)) == 6
+
+
+def test_search_cursor_pages_cover_every_row_once():
+    async def scenario():
+        engine, sessions = await _seed()
+        async with sessions() as db:
+            service = VideoSearchService(db)
+            seen = await _collect(
+                lambda limit, cursor: service.search_videos(
+                    "", limit=limit, cursor=cursor
+                ),
+                lambda video: encode_cursor(
+                    video.view_count, video.created_at, video.id
+                ),
+            )
+        await engine.dispose()
+        return seen
+
+    seen = asyncio.run(scenario())
+    assert len(seen) == 6
+    assert len(set(seen)) == 6
+
+
+def test_cached_cursor_page_keeps_has_prev():
+    # fastapi-cache re-validates hits through response_model
+    encoded = VideoListResponse.dump_bytes(
+        [], total=10, page=1, per_page=2, next_cursor="abc", has_prev=True
+    )
+    cached = VideoListResponse.model_validate_json(encoded)
+
+    assert cached.has_prev is True
+    assert cached.has_next is True
+    assert orjson.loads(cached.model_dump_json()) == orjson.loads(encoded)
@@ -0,0 +1,56 @@
+"""
+🧪 Presigned stream URL cache honours the requested lifetime
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.models.video import VideoStatus
+from app.services.video_service import VideoService
+
+
+class StubStorage:
+    def __init__(self):
+        self.signed = []
+
+    async def get_presigned_url(self, object_name, expires_in=3600):
+        self.signed.append(expires_in)
+        return f"https://storage/{object_name}?n={len(self.signed)}&ttl={expires_in}"
+
+
+def make_service(fake_redis):
+    storage = StubStorage()
+    service = VideoService(db=None, minio_service=storage, redis=fake_redis)
+
+    async def get_video_by_id(video_id):
+        return SimpleNamespace(status=VideoStatus.COMPLETED, file_path="videos/a.mp4")
+
+    service.get_video_by_id = get_video_by_id
+    return service, storage
+
+
+def test_long_lived_urls_are_reused_per_lifetime(fake_redis):
+    service, storage = make_service(fake_redis)
+
+    async def scenario():
+        first = await service.get_video_stream_url("v1", expires_in=3600)
+        again = await service.get_video_stream_url("v1", expires_in=3600)
+        other = await service.get_video_stream_url("v1", expires_in=7200)
+        return first, again, other
+
+    first, again, other = asyncio.run(scenario())
+    assert first == again
+    assert other != first
+    assert storage.signed == [3600, 7200]
+
+
+def test_short_lived_urls_are_never_cached(fake_redis):
+    service, storage = make_service(fake_redis)
+
+    async def scenario():
+        await service.get_video_stream_url("v1", expires_in=30)
+        await service.get_video_stream_url("v1", expires_in=30)
+
+    asyncio.run(scenario())
+    assert storage.signed == [30, 30]
+    assert fake_redis.data == {}